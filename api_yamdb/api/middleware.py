@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+
+from reviews.routers import routing_scope
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_COOKIE = 'use_primary_until'
+PRIMARY_HEADER = 'X-Use-Primary-Until'
+
+
+def get_primary_until(request):
+    value = request.COOKIES.get(PRIMARY_COOKIE) or request.headers.get(
+        PRIMARY_HEADER
+    )
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ReplicaRoutingMiddleware:
+    # Безопасные запросы читают из реплик. Клиент, который только что
+    # что-то записал, ещё REPLICA_STICKY_SECONDS читает из основной базы,
+    # чтобы увидеть свои изменения: срок передаётся в cookie и заголовке.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        allow_replica = (
+            request.method in SAFE_METHODS
+            and get_primary_until(request) <= time.time()
+        )
+        with routing_scope(allow_replica) as scope:
+            response = self.get_response(request)
+        if scope.written:
+            primary_until = time.time() + settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                PRIMARY_COOKIE, f'{primary_until:.3f}',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax'
+            )
+            response[PRIMARY_HEADER] = f'{primary_until:.3f}'
+        return response
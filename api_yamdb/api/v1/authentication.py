@@ -0,0 +1,161 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_yamdb.constants import USER_CACHE_MAX_SIZE, USER_CACHE_TTL
+from reviews.routers import primary_reads
+
+ROLE_CLAIMS = ('username', 'role', 'is_superuser')
+# Утверждения, от которых зависят права: если они изменились, токен
+# отзывается. Остальные просто перестают браться из токена.
+PRIVILEGE_CLAIMS = ('role', 'is_superuser')
+
+
+class UserCache:
+    # LRU-кеш пользователей процесса с ограниченным временем жизни записи.
+
+    def __init__(self, max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._users = OrderedDict()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        with self._lock:
+            self._users[user_id] = (
+                copy.copy(user), time.monotonic() + self.ttl
+            )
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_size:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id) if user_id is not None else None
+        if user is None:
+            with primary_reads():
+                user = super().get_user(validated_token)
+            user_cache.set(user.pk, user)
+        return user
+
+
+def get_role_claims(user):
+    return {claim: getattr(user, claim) for claim in ROLE_CLAIMS}
+
+
+def claims_state_key(user_id):
+    return f'token-claims:{user_id}'
+
+
+def update_claims_state(user_id, claims=None):
+    # Токены пользователя, чьи утверждения расходятся с сохранённым
+    # состоянием, отклоняются. None означает, что все токены отозваны.
+    cache.set(
+        claims_state_key(user_id), claims or {},
+        settings.JWT_ROLE_CLAIMS_LIFETIME.total_seconds()
+    )
+
+
+class RoleAccessToken(AccessToken):
+    lifetime = settings.JWT_ROLE_CLAIMS_LIFETIME
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim, value in get_role_claims(user).items():
+            token[claim] = value
+        return token
+
+
+def access_token_for_user(user):
+    if settings.JWT_ROLE_CLAIMS:
+        return RoleAccessToken.for_user(user)
+    return AccessToken.for_user(user)
+
+
+class TokenUser(SimpleLazyObject):
+    # Пользователь, роль и id которого известны из токена. Строка из базы
+    # загружается только при обращении к остальным атрибутам, и после
+    # этого все атрибуты читаются из неё: её могли изменить в запросе.
+
+    def __init__(self, func, user_id, claims):
+        super().__init__(func)
+        self.__dict__['_claims'] = dict(claims, id=user_id, pk=user_id)
+
+    def __getattr__(self, name):
+        claims = self.__dict__['_claims']
+        if self.__dict__['_wrapped'] is empty and name in claims:
+            return claims[name]
+        return super().__getattr__(name)
+
+    is_authenticated = True
+    is_anonymous = False
+
+    @property
+    def is_admin(self):
+        return self.role == 'admin'
+
+    @property
+    def is_moderator(self):
+        return self.role == 'moderator'
+
+
+class RoleClaimsJWTAuthentication(CachedJWTAuthentication):
+    def get_user(self, validated_token):
+        if not settings.JWT_ROLE_CLAIMS or any(
+            claim not in validated_token for claim in ROLE_CLAIMS
+        ):
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        claims = {claim: validated_token[claim] for claim in ROLE_CLAIMS}
+        state = cache.get(claims_state_key(user_id))
+        if state is not None and state != claims:
+            if not state or any(
+                state[claim] != claims[claim] for claim in PRIVILEGE_CLAIMS
+            ):
+                raise AuthenticationFailed(
+                    'Токен отозван', code='token_revoked'
+                )
+            # Сменилось только имя: права из токена верны, а остальное
+            # берём из базы.
+            return super().get_user(validated_token)
+        return TokenUser(
+            lambda: super(RoleClaimsJWTAuthentication, self).get_user(
+                validated_token
+            ),
+            user_id, claims
+        )
@@ -0,0 +1,59 @@
+import time
+from hashlib import md5
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def version_key(model):
+    return f'list-version:{model._meta.label_lower}'
+
+
+def get_list_version(model):
+    # Начальная версия берётся из времени, чтобы после вытеснения счётчика
+    # из кеша новые ключи не совпали со старыми страницами.
+    key = version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, time.time_ns())
+    return version
+
+
+def bump_list_version(model):
+    key = version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def list_cache_key(model, request):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    digest = md5(repr(params).encode()).hexdigest()
+    return (
+        f'list:{model._meta.label_lower}:{get_list_version(model)}:{digest}'
+    )
+
+
+def deleted_at_key(model):
+    return f'deleted-at:{model._meta.label_lower}'
+
+
+def touch_deleted_at(model):
+    cache.set(deleted_at_key(model), timezone.now(), None)
+
+
+def get_deleted_at(model):
+    # Если отметка вытеснена из кеша, считаем, что удаление было только что.
+    key = deleted_at_key(model)
+    deleted_at = cache.get(key)
+    if deleted_at is None:
+        now = timezone.now()
+        cache.add(key, now, None)
+        deleted_at = cache.get(key, now)
+    return deleted_at
@@ -0,0 +1,70 @@
+import csv
+import json
+
+from api_yamdb.constants import EXPORT_CHUNK_SIZE
+from reviews.models import Title
+
+EXPORT_FIELDS = (
+    'id', 'name', 'year', 'category', 'genre', 'rating', 'review_count'
+)
+
+
+class Echo:
+    # Файлоподобный объект для csv.writer: возвращает строку вместо записи.
+
+    def write(self, value):
+        return value
+
+
+def iter_title_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    # Произведения читаются страницами по id: каждая страница выбирается
+    # целиком, поэтому между страницами в базе не остаётся открытого
+    # курсора и блокировки чтения.
+    queryset = queryset.order_by('pk').values_list(
+        'pk', 'name', 'year', 'category__slug', 'rating', 'review_count'
+    )
+    last_pk = 0
+    while True:
+        page = list(
+            queryset.filter(pk__gt=last_pk)[:chunk_size].iterator(
+                chunk_size=chunk_size
+            )
+        )
+        if not page:
+            return
+        genres = {}
+        links = Title.genre.through.objects.filter(
+            title_id__in=[row[0] for row in page]
+        ).order_by('genre__slug').values_list('title_id', 'genre__slug')
+        for title_id, slug in links:
+            genres.setdefault(title_id, []).append(slug)
+        for pk, name, year, category, rating, review_count in page:
+            yield {
+                'id': pk,
+                'name': name,
+                'year': year,
+                'category': category,
+                'genre': genres.get(pk, []),
+                'rating': rating,
+                'review_count': review_count,
+            }
+        last_pk = page[-1][0]
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        row['genre'] = ','.join(row['genre'])
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+EXPORT_FORMATS = {
+    'ndjson': (stream_ndjson, 'application/x-ndjson; charset=utf-8'),
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+}
@@ -1,7 +1,29 @@
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.expressions import RawSQL
 from django_filters import rest_framework as filters
 
+from reviews.search import (
+    TITLE_INDEX, is_available, make_match_query, match_sql
+)
 from reviews.models import Title
 
+GENRE_MODE_OR = 'or'
+GENRE_MODE_AND = 'and'
+GENRE_MODES = (
+    (GENRE_MODE_OR, 'Любой из жанров'),
+    (GENRE_MODE_AND, 'Все жанры'),
+)
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
+
+def title_genres(**lookups):
+    return Exists(Title.genre.through.objects.filter(
+        title_id=OuterRef('pk'), **lookups
+    ))
+
 
 class TitlesFilter(filters.FilterSet):
     name = filters.CharFilter(
@@ -10,13 +32,44 @@ class TitlesFilter(filters.FilterSet):
     )
     category = filters.CharFilter(
         field_name='category__slug',
-        lookup_expr='icontains'
     )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
+    category__icontains = filters.CharFilter(
+        field_name='category__slug',
         lookup_expr='icontains'
     )
+    genre = CharInFilter(method='filter_genre')
+    genre__icontains = filters.CharFilter(method='filter_genre_icontains')
+    genre_mode = filters.ChoiceFilter(
+        choices=GENRE_MODES,
+        method='filter_genre_mode'
+    )
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+    def filter_genre(self, queryset, name, value):
+        if self.form.cleaned_data.get('genre_mode') == GENRE_MODE_AND:
+            for slug in set(value):
+                queryset = queryset.filter(title_genres(genre__slug=slug))
+            return queryset
+        return queryset.filter(title_genres(genre__slug__in=value))
+
+    def filter_genre_icontains(self, queryset, name, value):
+        return queryset.filter(title_genres(genre__slug__icontains=value))
+
+    def filter_genre_mode(self, queryset, name, value):
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        if not is_available():
+            return queryset.filter(
+                Q(name__icontains=value) | Q(description__icontains=value)
+            )
+        match_query = make_match_query(value)
+        if not match_query:
+            return queryset.none()
+        return queryset.filter(
+            id__in=RawSQL(match_sql(TITLE_INDEX), (match_query,))
+        )
@@ -1,6 +1,21 @@
-from rest_framework import mixins, viewsets
+from hashlib import md5
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.response import Response
 
+from api_yamdb.constants import LIST_CACHE_TIMEOUT
+from reviews.database import write_coordinator
+from reviews.routers import primary_reads
+from .cache import get_deleted_at, list_cache_key
+
 
 class ListCreateDestroyViewSet(
     mixins.ListModelMixin,
@@ -35,3 +50,127 @@ class ExcludePutViewSet(
     viewsets.GenericViewSet,
 ):
     pass
+
+
+class CachedListMixin:
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(self.queryset.model, request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        with primary_reads():
+            response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, LIST_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin:
+    # Ответы на GET сопровождаются ETag и Last-Modified, которые считаются
+    # одним агрегирующим запросом без загрузки и сериализации объектов.
+    # В conditional_related_fields перечисляются даты изменения связанных
+    # объектов, данные которых тоже выводятся в ответе.
+    conditional_related_fields = ()
+
+    def get_conditional_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_conditional_state(self, detail):
+        try:
+            queryset = self.get_conditional_queryset()
+            if detail:
+                lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+                queryset = queryset.filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                )
+        except (TypeError, ValueError, ValidationError):
+            # Неверный id в URL: ответ 404 вернёт сам обработчик.
+            return None
+        fields = ('updated_at', *self.conditional_related_fields)
+        state = queryset.order_by().aggregate(count=Count('pk'), **{
+            f'modified_{idx}': Max(field) for idx, field in enumerate(fields)
+        })
+        dates = [state.pop(f'modified_{idx}') for idx in range(len(fields))]
+        state['last_modified'] = max(
+            (date for date in dates if date is not None), default=None
+        )
+        if not detail:
+            deleted_at = get_deleted_at(queryset.model)
+            if state['last_modified'] is None or (
+                deleted_at > state['last_modified']
+            ):
+                state['last_modified'] = deleted_at
+        return state
+
+    def conditional_get(self, handler, request, *args, detail, **kwargs):
+        state = self.get_conditional_state(detail)
+        if state is None or state['last_modified'] is None:
+            return handler(request, *args, **kwargs)
+        etag = quote_etag(md5(
+            f'{request.get_full_path()}|{request.accepted_renderer.format}|'
+            f'{state["count"]}|{state["last_modified"].isoformat()}'.encode()
+        ).hexdigest())
+        # Last-Modified точен до секунды: пока секунда последнего изменения
+        # не закончилась, в ней возможны новые изменения с той же
+        # отметкой, поэтому до тех пор ответ проверяется только по ETag.
+        last_modified = None
+        if state['last_modified'] < timezone.now().replace(microsecond=0):
+            last_modified = int(state['last_modified'].timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(
+            super().list, request, *args, detail=False, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(
+            super().retrieve, request, *args, detail=True, **kwargs
+        )
+
+
+class NestedParentMixin:
+    # Родительский объект вложенного ресурса ищется один раз за запрос
+    # по всем аргументам URL сразу, поэтому связь между ними проверяется
+    # для любого действия.
+    parent_model = None
+    parent_lookup_kwargs = {}
+    parent_select_related = ()
+
+    @cached_property
+    def parent(self):
+        return get_object_or_404(
+            self.parent_model.objects.select_related(
+                *self.parent_select_related
+            ),
+            **{
+                field: self.kwargs.get(kwarg)
+                for field, kwarg in self.parent_lookup_kwargs.items()
+            }
+        )
+
+
+class CoordinatedWriteMixin:
+    # Изменяющие запросы выполняются целиком через write_coordinator:
+    # если SQLite занята другим процессом, запрос повторяется с начала.
+    # Обработчик оборачивается после проверки прав и ограничений частоты,
+    # поэтому так выполняются и стандартные, и дополнительные действия.
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        method = request.method.lower()
+        if request.method not in permissions.SAFE_METHODS and hasattr(
+            self, method
+        ):
+            setattr(self, method, write_coordinator.wrap(
+                getattr(self, method)
+            ))
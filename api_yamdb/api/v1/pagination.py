@@ -0,0 +1,38 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    # Курсорный режим включается параметром ?pagination=cursor и использует
+    # порядок из атрибута cursor_ordering представления.
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_query_param = 'cursor'
+
+    cursor_paginator = None
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or self.cursor_query_param in request.query_params
+        )
+
+    def get_cursor_paginator(self, view):
+        paginator = CursorPagination()
+        paginator.page_size = self.page_size
+        paginator.cursor_query_param = self.cursor_query_param
+        paginator.ordering = getattr(view, 'cursor_ordering', ('id',))
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_cursor(request):
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.get_cursor_paginator(view)
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
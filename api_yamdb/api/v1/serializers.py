@@ -1,14 +1,19 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
+from django.db import IntegrityError, transaction
 from rest_framework import serializers, exceptions
 from rest_framework.exceptions import ValidationError
-from rest_framework.validators import UniqueTogetherValidator
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.settings import api_settings
 
-from api_yamdb.constants import MAX_USERNAME_LENGHT, MAX_EMAIL_LENGTH
+from api_yamdb.constants import (MAX_EMAIL_LENGTH, MAX_USERNAME_LENGHT,
+                                 TITLE_BULK_MAX_ITEMS)
 from reviews.models import Category, Comment, Genre, Review, Title
 
 User = get_user_model()
 
+DUPLICATE_REVIEW = 'Нельзя повторно оценить произведение.'
+
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -22,8 +27,57 @@ class GenreSerializer(serializers.ModelSerializer):
         exclude = ('id',)
 
 
+def fetch_by_slugs(queryset, slugs, slug_field='slug'):
+    return {
+        getattr(obj, slug_field): obj
+        for obj in queryset.filter(**{f'{slug_field}__in': slugs})
+    }
+
+
+def pick_by_slugs(objects, slugs):
+    # Объекты по слагам из заранее загруженного словаря: о ненайденных
+    # сообщается одной ошибкой.
+    slugs = list(dict.fromkeys(slugs))
+    missing = [slug for slug in slugs if slug not in objects]
+    if missing:
+        raise ValidationError(
+            f'Не найдены объекты со слагами: {", ".join(missing)}.'
+        )
+    return [objects[slug] for slug in slugs]
+
+
+class SlugManyRelatedField(serializers.ManyRelatedField):
+    # Все слаги разрешаются одним запросом, а о ненайденных сообщается
+    # одной ошибкой.
+
+    def to_internal_value(self, data):
+        if isinstance(data, (str, dict)) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        if not all(isinstance(slug, str) for slug in data):
+            raise ValidationError('Слаги должны быть строками.')
+        slugs = list(dict.fromkeys(data))
+        objects = fetch_by_slugs(
+            self.child_relation.get_queryset(), slugs,
+            self.child_relation.slug_field
+        )
+        return pick_by_slugs(objects, slugs)
+
+
+class BulkSlugRelatedField(serializers.SlugRelatedField):
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return SlugManyRelatedField(**list_kwargs)
+
+
 class TitleSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = BulkSlugRelatedField(
         slug_field='slug', many=True, queryset=Genre.objects.all()
     )
     category = serializers.SlugRelatedField(
@@ -32,64 +86,132 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = Title.RATING_FIELDS + ('updated_at',)
 
+    def create(self, validated_data):
+        genres = validated_data.pop('genre', [])
+        with transaction.atomic():
+            title = super().create(validated_data)
+            title.update_genres(genres, created=True)
+        return title
+
+    def update(self, instance, validated_data):
+        genres = validated_data.pop('genre', None)
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            if genres is not None:
+                instance.update_genres(genres)
+        return instance
+
+
+class TitleBulkListSerializer(serializers.ListSerializer):
+    # Слаги жанров и категорий всех элементов разрешаются заранее,
+    # по одному запросу на модель.
+
+    def resolve_slugs(self, model, data, field_name):
+        slugs = set()
+        for item in data:
+            value = item.get(field_name) if isinstance(item, dict) else None
+            values = value if isinstance(value, list) else [value]
+            slugs.update(
+                slug for slug in values if isinstance(slug, str) and slug
+            )
+        return fetch_by_slugs(model.objects.all(), slugs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            if len(data) > TITLE_BULK_MAX_ITEMS:
+                raise ValidationError({
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        'Можно передать не больше '
+                        f'{TITLE_BULK_MAX_ITEMS} произведений.'
+                    ]
+                })
+            self.genres = self.resolve_slugs(Genre, data, 'genre')
+            self.categories = self.resolve_slugs(Category, data, 'category')
+        return super().to_internal_value(data)
 
-class TitleReadSerializer(serializers.ModelSerializer):
-    genre = GenreSerializer(many=True)
-    category = CategorySerializer()
-    rating = serializers.IntegerField(
-        read_only=True,
+    def create(self, validated_data):
+        titles = []
+        genres = []
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            genres.append(attrs.pop('genre'))
+            titles.append(Title(**attrs))
+        return Title.bulk_create_with_genres(titles, genres)
+
+
+class TitleBulkSerializer(serializers.ModelSerializer):
+    genre = serializers.ListField(
+        child=serializers.SlugField(), write_only=True
     )
+    category = serializers.SlugField(write_only=True)
 
     class Meta:
         model = Title
-        fields = ('__all__')
+        exclude = Title.RATING_FIELDS + ('updated_at',)
+        list_serializer_class = TitleBulkListSerializer
+
+    def validate_genre(self, value):
+        return pick_by_slugs(self.parent.genres, value)
+
+    def validate_category(self, value):
+        return pick_by_slugs(self.parent.categories, [value])[0]
 
 
-class GetDefaultTitleId:
-    requires_context = True
+class TitleReadSerializer(serializers.ModelSerializer):
+    genre = GenreSerializer(many=True)
+    category = CategorySerializer()
 
-    def __call__(self, serializer_field):
-        return (serializer_field.context['request']
-                .parser_context['kwargs']['title_id'])
+    class Meta:
+        model = Title
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre',
+            'category'
+        )
 
 
 class ReviewSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True,
-        default=serializers.CurrentUserDefault(),
     )
     title = serializers.SlugRelatedField(
         slug_field='name',
         read_only=True,
-        default=GetDefaultTitleId()
     )
 
     class Meta:
         model = Review
-        fields = ('__all__')
+        exclude = ('updated_at',)
         read_only_fields = ('author',)
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Review.objects.all(),
-                fields=('title', 'author'),
-                message='Нельзя повторно оценить произведение.'
+
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique_review в базе:
+        # так не нужен отдельный запрос, и параллельные запросы не
+        # проскочат проверку.
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author']
+            ).exists():
+                raise
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW]},
+                code='unique'
             )
-        ]
 
 
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True,
     )
-    review = serializers.SlugRelatedField(
-        slug_field='text', read_only=True,
-    )
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
         model = Comment
-        fields = ('__all__')
+        exclude = ('updated_at',)
 
 
 class UserSignUpSerializer(serializers.Serializer):
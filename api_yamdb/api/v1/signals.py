@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_migrate, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import catalog_imported
+from .authentication import get_role_claims, update_claims_state, user_cache
+from .cache import bump_list_version, touch_deleted_at
+from .throttling import get_bucket_storage
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def cached_list_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_list_version(sender))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def conditional_list_changed(sender, **kwargs):
+    transaction.on_commit(lambda: touch_deleted_at(sender))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def title_relation_changed(sender, instance, created=False, raw=False,
+                           **kwargs):
+    # Категория и жанры выводятся в ответе о произведении, но их изменение
+    # и удаление (SET_NULL и удаление связей) не меняют Title.updated_at,
+    # поэтому дату изменения произведений сдвигаем сами.
+    if created or raw:
+        return
+    field = 'category' if sender is Category else 'genre'
+    Title.objects.filter(**{field: instance}).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(pre_save, sender=User)
+def username_changing(sender, instance, raw=False, update_fields=None,
+                      **kwargs):
+    # Имя автора выводится в отзывах и комментариях: при его смене
+    # сдвигаем их дату изменения, чтобы сменились ETag и Last-Modified.
+    if raw or instance._state.adding or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        return
+    username = User.objects.filter(pk=instance.pk).values_list(
+        'username', flat=True
+    ).first()
+    if username is not None and username != instance.username:
+        now = timezone.now()
+        for model in (Review, Comment):
+            model.objects.filter(author_id=instance.pk).update(updated_at=now)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Сбрасываем запись сразу и после коммита, чтобы параллельный запрос
+    # не успел закешировать старую строку до фиксации транзакции.
+    pk = instance.pk
+    user_cache.invalidate(pk)
+    transaction.on_commit(lambda: user_cache.invalidate(pk))
+
+
+@receiver(post_save, sender=User)
+def user_claims_changed(sender, instance, **kwargs):
+    if settings.JWT_ROLE_CLAIMS:
+        claims = get_role_claims(instance) if instance.is_active else None
+        transaction.on_commit(
+            lambda: update_claims_state(instance.pk, claims)
+        )
+
+
+@receiver(post_delete, sender=User)
+def user_claims_revoked(sender, instance, **kwargs):
+    if settings.JWT_ROLE_CLAIMS:
+        pk = instance.pk
+        transaction.on_commit(lambda: update_claims_state(pk))
+
+
+@receiver(catalog_imported)
+def catalog_changed(**kwargs):
+    for model in (Category, Genre):
+        bump_list_version(model)
+    user_cache.clear()
+
+
+@receiver(post_migrate)
+def reset_caches(**kwargs):
+    catalog_changed()
+    get_bucket_storage().clear()
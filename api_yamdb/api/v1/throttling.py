@@ -0,0 +1,157 @@
+import threading
+from collections import OrderedDict
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from api_yamdb.constants import THROTTLE_LOCAL_MAX_BUCKETS
+
+
+def take_token(state, capacity, rate, now):
+    # Корзина пополняется равномерно со скоростью rate токенов в секунду
+    # и вмещает не больше capacity токенов. Возвращает новое состояние
+    # и время ожидания следующего токена (0, если запрос разрешён).
+    tokens, updated_at = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated_at) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / rate
+
+
+class LocalBucketStorage:
+    # Корзины в памяти процесса: при нескольких процессах лимиты
+    # действуют в каждом из них отдельно.
+
+    def __init__(self, max_size=THROTTLE_LOCAL_MAX_BUCKETS):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def consume(self, key, capacity, rate, now):
+        with self._lock:
+            state, wait = take_token(
+                self._buckets.get(key), capacity, rate, now
+            )
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStorage:
+    # Корзины в общем кеше Django. Чтение и запись не атомарны, поэтому
+    # при одновременных запросах лимит соблюдается приблизительно.
+
+    def consume(self, key, capacity, rate, now):
+        state, wait = take_token(cache.get(key), capacity, rate, now)
+        # Полностью пополненная корзина не отличается от отсутствующей.
+        cache.set(key, state, capacity / rate)
+        return wait
+
+    def clear(self):
+        pass
+
+
+_storages = {}
+
+
+def get_bucket_storage():
+    path = settings.THROTTLE_BUCKET_STORAGE
+    if path not in _storages:
+        _storages[path] = import_string(path)()
+    return _storages[path]
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    # Скорость вида «N/период» задаёт ёмкость корзины N и пополнение
+    # N токенов за период. Отклонение запроса не обращается к базе.
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def get_rate(self):
+        # Лимиты читаются при каждом запросе, а не при импорте класса.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_keys(self, request, view):
+        key = self.get_cache_key(request, view)
+        return [] if key is None else [key]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        storage = get_bucket_storage()
+        rate = self.num_requests / self.duration
+        now = self.timer()
+        self._wait = 0
+        for key in self.get_cache_keys(request, view):
+            self._wait = storage.consume(key, self.num_requests, rate, now)
+            if self._wait:
+                return False
+        return True
+
+    def wait(self):
+        return self._wait
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+class AuthIdentityThrottle(TokenBucketThrottle):
+    scope = 'auth_identity'
+    identity_fields = ('username', 'email')
+
+    def get_cache_keys(self, request, view):
+        data = request.data
+        if not hasattr(data, 'get'):
+            return []
+        # Значения хешируются, чтобы ключ подходил любому бэкенду кеша.
+        return [
+            self.cache_format % {
+                'scope': self.scope,
+                'ident': field + ':' + md5(
+                    str(data[field]).casefold().encode()
+                ).hexdigest()
+            }
+            for field in self.identity_fields if data.get(field)
+        ]
+
+
+class UserCreateThrottle(TokenBucketThrottle):
+    # Ограничивает только создание объектов; область лимита берётся
+    # из атрибута throttle_scope представления.
+
+    def allow_request(self, request, view):
+        if request.method != 'POST':
+            return True
+        self.scope = getattr(view, 'throttle_scope', None)
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_rate(self):
+        if self.scope is None:
+            return None
+        return super().get_rate()
+
+    def get_cache_key(self, request, view):
+        if not request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': request.user.pk
+        }
@@ -2,8 +2,8 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
-    CategoryViewSet, GenreViewSet, TitleViewSet,
-    CommentViewSet, ReviewViewSet, UserGetTokenAPIView,
+    CategoryViewSet, DatabaseMetricsAPIView, GenreViewSet, TitleViewSet,
+    CommentViewSet, ReviewViewSet, SearchAPIView, UserGetTokenAPIView,
     UserSignUpAPIView, UserViewSet
 )
 
@@ -23,6 +23,11 @@ api_v1.auth = [
 
 ]
 urlpatterns = [
+    path('search/', SearchAPIView.as_view(), name='search'),
+    path(
+        'metrics/database/', DatabaseMetricsAPIView.as_view(),
+        name='database-metrics'
+    ),
     path('', include(api_v1.urls)),
     path('auth/', include(api_v1.auth)),
 ]
@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 
@@ -7,27 +10,40 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.views import APIView
 
-from reviews.models import Category, Genre, Review, Title
+from api_yamdb.constants import AUTOCOMPLETE_LIMIT
+from reviews import search
+from reviews.database import write_coordinator
+from reviews.autocomplete import title_index
+from reviews.models import Category, Comment, Genre, Review, Title
+from .authentication import access_token_for_user
+from .export import EXPORT_FORMATS, iter_title_rows
 from .filters import TitlesFilter
-from .mixins import ListCreateDestroyViewSet, ExcludePutViewSet
+from .mixins import (CachedListMixin, ConditionalGetMixin,
+                     CoordinatedWriteMixin, ExcludePutViewSet,
+                     ListCreateDestroyViewSet, NestedParentMixin)
+from .pagination import PageNumberOrCursorPagination
 from .permissions import (IsAdmin, IsAdminModeratorOwnerOrReadOnly,
                           IsAdminOrReadOnly)
 from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, TitleReadSerializer,
-                          ReviewSerializer, TitleSerializer,
+                          GenreSerializer, TitleBulkSerializer,
+                          TitleReadSerializer, ReviewSerializer,
+                          TitleSerializer,
                           UserSerializer, UserTokenSerializer,
                           UserSignUpSerializer, UserTokenSerializer)
+from .throttling import (AuthIdentityThrottle, AuthIPThrottle,
+                         UserCreateThrottle)
 from .utils import send_message_to_user, make_confirmation_code
 
 User = get_user_model()
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(CoordinatedWriteMixin, CachedListMixin,
+                      ListCreateDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
@@ -36,7 +52,8 @@ class CategoryViewSet(ListCreateDestroyViewSet):
     lookup_field = 'slug'
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(CoordinatedWriteMixin, CachedListMixin,
+                   ListCreateDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
@@ -45,93 +62,220 @@ class GenreViewSet(ListCreateDestroyViewSet):
     lookup_field = 'slug'
 
 
-class TitleViewSet(ExcludePutViewSet):
-    queryset = Title.objects.order_by('id').annotate(
-        rating=Avg('reviews__score')
-    )
+class TitleViewSet(CoordinatedWriteMixin, ConditionalGetMixin,
+                   ExcludePutViewSet):
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('id')
     serializer_class = TitleSerializer
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitlesFilter
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('id',)
 
     def get_serializer_class(self):
         if self.action in ('retrieve', 'list'):
             return TitleReadSerializer
         return TitleSerializer
 
+    @action(methods=['get'], detail=False, url_path='autocomplete')
+    def autocomplete(self, request):
+        try:
+            limit = min(
+                int(request.query_params.get('limit', AUTOCOMPLETE_LIMIT)),
+                AUTOCOMPLETE_LIMIT
+            )
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        return Response(
+            title_index.search(request.query_params.get('q', ''), limit)
+        )
+
+    @action(methods=['post'], detail=False, url_path='bulk')
+    def bulk_create(self, request):
+        serializer = TitleBulkSerializer(
+            data=request.data, many=True, allow_empty=False
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class ReviewViewSet(ExcludePutViewSet):
+    @action(
+        methods=['get'], detail=False, url_path='export',
+        permission_classes=[IsAdmin]
+    )
+    def export(self, request):
+        export_format = request.query_params.get('type', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({
+                'type': f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}.'
+            })
+        stream, content_type = EXPORT_FORMATS[export_format]
+        queryset = self.filter_queryset(Title.objects.all())
+        # Синхронный поток занимает поток воркера до конца скачивания;
+        # параллельные запросы обслуживают другие воркеры и потоки.
+        response = StreamingHttpResponse(
+            stream(iter_title_rows(queryset)), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{export_format}"'
+        )
+        return response
+
+
+class ReviewViewSet(CoordinatedWriteMixin, NestedParentMixin,
+                    ConditionalGetMixin, ExcludePutViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [IsAdminModeratorOwnerOrReadOnly]
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('pub_date', 'id')
+    parent_model = Title
+    parent_lookup_kwargs = {'pk': 'title_id'}
+    conditional_related_fields = ('title__updated_at',)
+    throttle_classes = (UserCreateThrottle,)
+    throttle_scope = 'review_create'
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return self.parent.reviews.select_related('author', 'title')
+
+    def get_conditional_queryset(self):
+        return Review.objects.filter(title_id=self.kwargs.get('title_id'))
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            title=get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        )
+        serializer.save(author=self.request.user, title=self.parent)
 
 
-class CommentViewSet(ExcludePutViewSet):
+class CommentViewSet(CoordinatedWriteMixin, NestedParentMixin,
+                     ConditionalGetMixin, ExcludePutViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsAdminModeratorOwnerOrReadOnly]
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('pub_date', 'id')
+    parent_model = Review
+    parent_lookup_kwargs = {'pk': 'review_id', 'title_id': 'title_id'}
+    parent_select_related = ('title',)
+    throttle_classes = (UserCreateThrottle,)
+    throttle_scope = 'comment_create'
 
     def get_queryset(self):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        return review.comments.all()
+        return self.parent.comments.select_related('author')
+
+    def get_conditional_queryset(self):
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id')
+        )
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.parent)
+
+
+class SearchAPIView(APIView):
+    permission_classes = (permissions.AllowAny,)
+
+    def get(self, request):
+        if not search.is_available():
+            return Response(
+                {'detail': 'Полнотекстовый поиск недоступен.'},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        query = request.query_params.get('q', '')
+        title_ids = search.search_title_ids(query)
+        review_ids = search.search_review_ids(query)
+        titles = TitleViewSet.queryset.in_bulk(title_ids)
+        reviews = Review.objects.select_related(
+            'author', 'title'
+        ).in_bulk(review_ids)
+        context = {'request': request}
+        return Response({
+            'titles': TitleReadSerializer(
+                [titles[pk] for pk in title_ids if pk in titles],
+                many=True, context=context
+            ).data,
+            'reviews': ReviewSerializer(
+                [reviews[pk] for pk in review_ids if pk in reviews],
+                many=True, context=context
+            ).data,
+        })
 
 
-class UserSignUpAPIView(APIView):
+class DatabaseMetricsAPIView(APIView):
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response(dict(
+            write_coordinator.metrics.snapshot(),
+            single_writer=settings.SQLITE_SINGLE_WRITER,
+        ))
+
+
+class UserSignUpAPIView(CoordinatedWriteMixin, APIView):
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (AuthIPThrottle, AuthIdentityThrottle)
+
+    @staticmethod
+    def get_existing_user(username, email):
+        users = list(
+            User.objects.filter(Q(username=username) | Q(email=email))[:2]
+        )
+        for user in users:
+            if user.username == username and user.email == email:
+                return user
+        errors = {}
+        for user in users:
+            if user.username == username:
+                errors['username'] = (
+                    'Пользователь с таким именем уже существует.'
+                )
+            if user.email == email:
+                errors['email'] = 'Пользователь с таким email уже существует.'
+        if errors:
+            raise ValidationError(errors)
+        return None
 
     def post(self, request):
-        username = request.data.get('username')
-        email = request.data.get('email')
-        if User.objects.filter(username=username, email=email).exists():
-            send_message_to_user(username, email, make_confirmation_code(
-                get_object_or_404(User, username=username)))
-            return Response(request.data, status=status.HTTP_200_OK)
-        if ((User.objects.filter(email=email).exists()
-             and not User.objects.filter(username=username).exists())
-                or (User.objects.filter(username=username).exists()
-                    and User.objects.filter(email=email) != email)):
-            return Response(status=status.HTTP_400_BAD_REQUEST)
         serializer = UserSignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        send_message_to_user(username, email,
-                             make_confirmation_code(serializer.save()))
+        username = serializer.validated_data['username']
+        email = serializer.validated_data['email']
+        user = self.get_existing_user(username, email)
+        if user is None:
+            try:
+                with transaction.atomic():
+                    user = serializer.save()
+            except IntegrityError:
+                # Параллельная регистрация успела создать пользователя:
+                # решение принимаем по уникальным ограничениям базы.
+                user = self.get_existing_user(username, email)
+                if user is None:
+                    raise
+        send_message_to_user(username, email, make_confirmation_code(user))
         return Response(request.data, status=status.HTTP_200_OK)
 
 
 class UserGetTokenAPIView(APIView):
     queryset = User.objects.all()
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (AuthIPThrottle, AuthIdentityThrottle)
 
     def post(self, request):
         serializer = UserTokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        username = serializer.validated_data["username"]
+        user = get_object_or_404(
+            User, username=serializer.validated_data['username']
+        )
         if default_token_generator.check_token(
-                username, serializer.data['confirmation_code']
+                user, serializer.validated_data['confirmation_code']
         ):
-            token = AccessToken.for_user(username)
+            token = access_token_for_user(user)
             return Response(
                 {'token': str(token)}, status=status.HTTP_200_OK
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserViewSet(ExcludePutViewSet):
+class UserViewSet(CoordinatedWriteMixin, ExcludePutViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAdmin,)
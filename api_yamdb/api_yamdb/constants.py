@@ -3,3 +3,24 @@ MAX_ROLE_LENGHT = 50
 MAX_USERNAME_LENGHT = 150
 MAX_LENGHT = 20
 MAX_EMAIL_LENGTH = 254
+SEARCH_RESULTS_LIMIT = 20
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_TOP_PREFIX_LENGTH = 3
+AUTOCOMPLETE_SCAN_LIMIT = 500
+AUTOCOMPLETE_VERSION_CHECK_INTERVAL = 1
+LIST_CACHE_TIMEOUT = 60 * 60
+USER_CACHE_MAX_SIZE = 1024
+USER_CACHE_TTL = 60
+MAX_SUBJECT_LENGTH = 255
+MAX_STATUS_LENGTH = 20
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 30
+OUTBOX_MAX_RETRY_DELAY = 60 * 60
+OUTBOX_POLL_INTERVAL = 5
+THROTTLE_LOCAL_MAX_BUCKETS = 10000
+TITLE_BULK_MAX_ITEMS = 1000
+IMPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 500
+WRITE_RETRY_DELAY = 0.05
+WRITE_MAX_RETRY_DELAY = 1
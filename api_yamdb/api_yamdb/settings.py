@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,6 +78,42 @@ DATABASES = {
     }
 }
 
+# Параметры, которые задаются каждому новому соединению с SQLite.
+# В режиме WAL читатели не ждут пишущую транзакцию.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+# Сколько раз повторять пишущую транзакцию, получившую «database is
+# locked», и пропускать ли все записи процесса через одного писателя.
+SQLITE_WRITE_RETRIES = 5
+SQLITE_SINGLE_WRITER = False
+
+# Реплики только для чтения. Локально реплика включается переменной
+# окружения DB_REPLICA, а её файл обновляет команда replicate_db.
+DATABASE_REPLICAS = []
+if os.getenv('DB_REPLICA'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append('replica')
+DATABASE_ROUTERS = ['reviews.routers.PrimaryReplicaRouter']
+# Сколько секунд после записи клиент читает из основной базы.
+REPLICA_STICKY_SECONDS = 5
+
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 # Password validation
 
@@ -125,7 +162,7 @@ DEFAULT_FROM_EMAIL = 'api@yamdb.com'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.v1.authentication.RoleClaimsJWTAuthentication",
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -133,9 +170,24 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.'
                                 'PageNumberPagination',
     "PAGE_SIZE": 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': '60/min',
+        'auth_identity': '10/min',
+        'review_create': '30/min',
+        'comment_create': '60/min',
+    },
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+
+# Выдавать токены с ролью пользователя, чтобы проверять права без запроса
+# к базе. Время жизни таких токенов ограничивает задержку их отзыва.
+JWT_ROLE_CLAIMS = False
+JWT_ROLE_CLAIMS_LIFETIME = timedelta(minutes=5)
+
+# Хранилище корзин ограничения частоты запросов: LocalBucketStorage
+# в памяти процесса или CacheBucketStorage в общем кеше.
+THROTTLE_BUCKET_STORAGE = 'api.v1.throttling.LocalBucketStorage'
@@ -6,3 +6,15 @@ class ReviewsConfig(AppConfig):
     name = 'reviews'
     verbose_name = 'Отзыв'
     verbose_name_plural = 'Отзывы'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+
+        from . import signals
+        from .database import configure_sqlite
+        from .search import create_search_indexes
+
+        connection_created.connect(configure_sqlite)
+        post_migrate.connect(create_search_indexes, sender=self)
+        post_migrate.connect(signals.reset_title_index, sender=self)
@@ -0,0 +1,220 @@
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from api_yamdb.constants import (AUTOCOMPLETE_LIMIT,
+                                 AUTOCOMPLETE_SCAN_LIMIT,
+                                 AUTOCOMPLETE_TOP_PREFIX_LENGTH,
+                                 AUTOCOMPLETE_VERSION_CHECK_INTERVAL)
+
+from .search import normalize as normalize_yo
+
+MAX_CHAR = chr(0x10FFFF)
+VERSION_KEY = 'title-index-version'
+
+
+def normalize(name):
+    return normalize_yo(unicodedata.normalize('NFKC', name).casefold())
+
+
+def get_shared_version():
+    # Общая для процессов версия индекса. Начальное значение берётся из
+    # времени, чтобы после вытеснения из кеша она не совпала с прежней.
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY, time.time_ns())
+    return version
+
+
+def bump_shared_version():
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(VERSION_KEY, version, None)
+        return version
+
+
+def short_prefixes(key):
+    length = min(len(key), AUTOCOMPLETE_TOP_PREFIX_LENGTH)
+    return [key[:end] for end in range(1, length + 1)]
+
+
+class TitlePrefixIndex:
+    # Индекс хранится в памяти процесса: отсортированный список ключей
+    # (нормализованное название, id) и популярность каждого произведения.
+    # Для префиксов с большим числом совпадений лучшие подсказки хранятся
+    # готовыми списками рангов: короткие префиксы заполняются при
+    # построении, остальные — при первом поиске. Перебор совпадений
+    # остаётся только для префиксов, у которых их немного.
+    # Каждое изменение увеличивает общую версию в кеше; по ней процесс
+    # узнаёт об изменениях, сделанных в других процессах.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = None
+        self._titles = {}
+        self._top = {}
+        self._version = None
+        self._checked_at = 0
+
+    def clear(self):
+        with self._lock:
+            self._keys = None
+            self._titles = {}
+            self._top = {}
+            bump_shared_version()
+
+    def build(self):
+        from .models import Title
+
+        # Версия читается до загрузки: изменение, сделанное во время
+        # загрузки, вызовет ещё одну перестройку, а не потеряется.
+        version = get_shared_version()
+        titles = Title.objects.using(DEFAULT_DB_ALIAS).values_list(
+            'id', 'name', 'review_count'
+        )
+        with self._lock:
+            self._version = version
+            self._checked_at = time.monotonic()
+            self.load(titles.iterator())
+
+    def load(self, titles):
+        with self._lock:
+            self._titles = {
+                pk: (normalize(name), name, review_count)
+                for pk, name, review_count in titles
+            }
+            self._keys = sorted(
+                (key, pk) for pk, (key, _, _) in self._titles.items()
+            )
+            self._top = {}
+            for rank in sorted(map(self._rank, self._titles)):
+                for prefix in short_prefixes(rank[1]):
+                    top = self._top.setdefault(prefix, [])
+                    if len(top) < AUTOCOMPLETE_LIMIT:
+                        top.append(rank)
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._keys is not None and (
+            now - self._checked_at >= AUTOCOMPLETE_VERSION_CHECK_INTERVAL
+        ):
+            self._checked_at = now
+            if get_shared_version() != self._version:
+                self._keys = None
+        if self._keys is None:
+            self.build()
+
+    def _changed(self):
+        # Своё изменение уже применено к индексу: если до него версия
+        # совпадала с общей, перестраивать индекс не нужно.
+        version = bump_shared_version()
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+
+    def _rank(self, pk):
+        key, _, review_count = self._titles[pk]
+        return (-review_count, key, pk)
+
+    def _top_lists(self, key):
+        for end in range(1, len(key) + 1):
+            top = self._top.get(key[:end])
+            if top is not None:
+                yield key[:end], top
+
+    def _top_discard(self, pk, key):
+        # Неполный список содержит все совпадения, и из него произведение
+        # просто убирается. Из полного на освободившееся место может
+        # подняться любое другое, поэтому список пересчитается при поиске.
+        for prefix, top in list(self._top_lists(key)):
+            ranks = [rank for rank in top if rank[2] != pk]
+            if len(ranks) == len(top):
+                continue
+            if len(top) < AUTOCOMPLETE_LIMIT:
+                self._top[prefix] = ranks
+            else:
+                del self._top[prefix]
+
+    def _top_offer(self, pk):
+        # Ранг произведения не ухудшился, поэтому остальные места в списке
+        # остаются верными.
+        rank = self._rank(pk)
+        for _, top in self._top_lists(rank[1]):
+            top[:] = [item for item in top if item[2] != pk]
+            insort(top, rank)
+            del top[AUTOCOMPLETE_LIMIT:]
+
+    def _discard(self, pk):
+        title = self._titles.pop(pk, None)
+        if title is not None:
+            key = (title[0], pk)
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+            self._top_discard(pk, title[0])
+        return title
+
+    def update(self, pk, name, review_count=None):
+        with self._lock:
+            if self._keys is not None:
+                title = self._discard(pk)
+                if review_count is None:
+                    review_count = title[2] if title is not None else 0
+                key = normalize(name)
+                self._titles[pk] = (key, name, review_count)
+                insort(self._keys, (key, pk))
+                self._top_offer(pk)
+            self._changed()
+
+    def remove(self, pk):
+        with self._lock:
+            if self._keys is not None:
+                self._discard(pk)
+            self._changed()
+
+    def change_popularity(self, pk, delta):
+        with self._lock:
+            title = self._titles.get(pk)
+            if title is not None:
+                if delta < 0:
+                    self._top_discard(pk, title[0])
+                self._titles[pk] = (title[0], title[1], title[2] + delta)
+                self._top_offer(pk)
+            self._changed()
+
+    def _get_top(self, prefix):
+        top = self._top.get(prefix)
+        if top is not None:
+            return top
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + MAX_CHAR,), start)
+        top = heapq.nsmallest(AUTOCOMPLETE_LIMIT, (
+            self._rank(self._keys[position][1])
+            for position in range(start, end)
+        ))
+        # Сохраняются только списки для префиксов с большим числом
+        # совпадений: их немного, и память индекса остаётся ограниченной.
+        if end - start > AUTOCOMPLETE_SCAN_LIMIT:
+            self._top[prefix] = top
+        return top
+
+    def search(self, query, limit=AUTOCOMPLETE_LIMIT):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        with self._lock:
+            self._ensure_fresh()
+            best = self._get_top(prefix)[:limit]
+            return [
+                {'id': pk, 'name': self._titles[pk][1]} for _, _, pk in best
+            ]
+
+
+title_index = TitlePrefixIndex()
@@ -0,0 +1,124 @@
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import (DEFAULT_DB_ALIAS, OperationalError, connections,
+                       transaction)
+
+from api_yamdb.constants import WRITE_MAX_RETRY_DELAY, WRITE_RETRY_DELAY
+
+PRAGMA_VALUE = re.compile(r'-?\w+')
+
+
+def pragma_statements(pragmas):
+    for name, value in pragmas.items():
+        if not name.isidentifier() or not PRAGMA_VALUE.fullmatch(str(value)):
+            raise ImproperlyConfigured(
+                f'Недопустимый параметр SQLite: {name} = {value}'
+            )
+        yield f'PRAGMA {name} = {value}'
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(settings.SQLITE_PRAGMAS):
+            cursor.execute(statement)
+
+
+def is_busy_error(error):
+    message = str(error)
+    return 'database is locked' in message or 'database is busy' in message
+
+
+def get_retry_delay(attempt):
+    # Экспоненциальная задержка со случайным разбросом, чтобы повторы
+    # разных потоков не совпадали по времени.
+    return random.uniform(0, min(
+        WRITE_RETRY_DELAY * 2 ** attempt, WRITE_MAX_RETRY_DELAY
+    ))
+
+
+class WriteMetrics:
+    FIELDS = (
+        'transactions', 'retries', 'failures', 'busy_wait_seconds',
+        'writer_wait_seconds',
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def add(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                self._values[name] += value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        with self._lock:
+            self._values = dict.fromkeys(self.FIELDS, 0)
+
+
+class WriteCoordinator:
+    # Пишущие транзакции SQLite повторяются при блокировке базы. В режиме
+    # одного писателя потоки процесса выполняют их по очереди и не
+    # соревнуются за блокировку SQLite.
+
+    def __init__(self):
+        self._writer_lock = threading.RLock()
+        self.metrics = WriteMetrics()
+
+    @contextmanager
+    def writer(self):
+        if not settings.SQLITE_SINGLE_WRITER:
+            yield
+            return
+        started = time.monotonic()
+        with self._writer_lock:
+            self.metrics.add(writer_wait_seconds=time.monotonic() - started)
+            yield
+
+    def run(self, func, using=DEFAULT_DB_ALIAS):
+        connection = connections[using]
+        if connection.vendor != 'sqlite' or connection.in_atomic_block:
+            # Внутри чужой транзакции повтор невозможен: её откатывает
+            # и повторяет вызывающий код.
+            return func()
+        retries = settings.SQLITE_WRITE_RETRIES
+        for attempt in range(retries + 1):
+            started = time.monotonic()
+            try:
+                with self.writer(), transaction.atomic(using=using):
+                    result = func()
+            except OperationalError as error:
+                if not is_busy_error(error):
+                    raise
+                waited = time.monotonic() - started
+                if attempt == retries:
+                    self.metrics.add(failures=1, busy_wait_seconds=waited)
+                    raise
+                delay = get_retry_delay(attempt)
+                self.metrics.add(retries=1, busy_wait_seconds=waited + delay)
+                time.sleep(delay)
+            else:
+                self.metrics.add(transactions=1)
+                return result
+
+    def wrap(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(lambda: func(*args, **kwargs))
+        return wrapper
+
+
+write_coordinator = WriteCoordinator()
@@ -0,0 +1,308 @@
+import csv
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db.models import UniqueConstraint
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api_yamdb.constants import IMPORT_BATCH_SIZE
+from .database import write_coordinator
+from .models import Category, Comment, Genre, Review, Title
+from .signals import catalog_imported
+
+User = get_user_model()
+GenreTitle = Title.genre.through
+
+
+class ImportRowError(Exception):
+    pass
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def format_error(error):
+    if isinstance(error, ValidationError):
+        return '; '.join(error.messages)
+    if isinstance(error, KeyError):
+        return f'нет колонки {error}'
+    return str(error)
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    # Даты публикации берутся из файла, а не из времени загрузки.
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class IdMap:
+    # Множество id модели: строки, уже сохранённые в базе, и загруженные.
+    # Внешние ключи проверяются по нему без запросов к базе.
+
+    def __init__(self, model):
+        self.model = model
+        self._ids = None
+
+    @property
+    def ids(self):
+        if self._ids is None:
+            self._ids = set(
+                self.model.objects.values_list('pk', flat=True).iterator()
+            )
+        return self._ids
+
+    def __contains__(self, pk):
+        return pk in self.ids
+
+    def add(self, pk):
+        self.ids.add(pk)
+
+
+def unique_field_sets(model):
+    opts = model._meta
+    field_sets = [
+        (field.name,) for field in opts.concrete_fields
+        if field.unique and not field.primary_key
+    ]
+    field_sets += [tuple(fields) for fields in opts.unique_together]
+    field_sets += [
+        tuple(constraint.fields) for constraint in opts.constraints
+        if isinstance(constraint, UniqueConstraint)
+        and constraint.condition is None
+    ]
+    return [
+        tuple(opts.get_field(name).attname for name in fields)
+        for fields in field_sets
+    ]
+
+
+class UniqueKeys:
+    # Значения уникальных полей модели: сохранённые в базе и загруженные.
+    # Повторяющаяся строка пропускается до bulk_create, иначе
+    # IntegrityError оборвал бы загрузку посреди пакета.
+
+    def __init__(self, model):
+        self.model = model
+        self._values = {fields: None for fields in unique_field_sets(model)}
+
+    def get_values(self, fields):
+        if self._values[fields] is None:
+            self._values[fields] = set(
+                self.model.objects.values_list(*fields).iterator()
+            )
+        return self._values[fields]
+
+    def find_duplicate(self, instance):
+        for fields in self._values:
+            key = tuple(getattr(instance, name) for name in fields)
+            if key in self.get_values(fields):
+                return fields
+        return None
+
+    def add(self, instance):
+        for fields in self._values:
+            self.get_values(fields).add(
+                tuple(getattr(instance, name) for name in fields)
+            )
+
+
+def build_category(importer, row):
+    return Category(id=int(row['id']), name=row['name'], slug=row['slug'])
+
+
+def build_genre(importer, row):
+    return Genre(id=int(row['id']), name=row['name'], slug=row['slug'])
+
+
+def build_user(importer, row):
+    return User(
+        id=int(row['id']),
+        username=row['username'],
+        email=row['email'],
+        role=row.get('role') or User.USER,
+        bio=row.get('bio') or '',
+        first_name=row.get('first_name') or '',
+        last_name=row.get('last_name') or '',
+        password=make_password(None),
+    )
+
+
+def build_title(importer, row):
+    return Title(
+        id=int(row['id']),
+        name=row['name'],
+        year=int(row['year']),
+        description=row.get('description') or None,
+        category_id=importer.resolve(Category, row.get('category')),
+    )
+
+
+def build_genre_title(importer, row):
+    return GenreTitle(
+        id=int(row['id']),
+        title_id=importer.resolve(Title, row['title_id'], required=True),
+        genre_id=importer.resolve(Genre, row['genre_id'], required=True),
+    )
+
+
+def build_review(importer, row):
+    return Review(
+        id=int(row['id']),
+        title_id=importer.resolve(Title, row['title_id'], required=True),
+        author_id=importer.resolve(User, row['author'], required=True),
+        text=row['text'],
+        score=int(row['score']),
+        pub_date=importer.parse_date(row.get('pub_date')),
+    )
+
+
+def build_comment(importer, row):
+    return Comment(
+        id=int(row['id']),
+        review_id=importer.resolve(Review, row['review_id'], required=True),
+        author_id=importer.resolve(User, row['author'], required=True),
+        text=row['text'],
+        pub_date=importer.parse_date(row.get('pub_date')),
+    )
+
+
+# Порядок загрузки: сначала модели, на которые ссылаются остальные.
+IMPORT_FILES = (
+    ('category.csv', Category, build_category),
+    ('genre.csv', Genre, build_genre),
+    ('users.csv', User, build_user),
+    ('titles.csv', Title, build_title),
+    ('genre_title.csv', GenreTitle, build_genre_title),
+    ('review.csv', Review, build_review),
+    ('comments.csv', Comment, build_comment),
+)
+
+
+class CatalogImporter:
+
+    def __init__(self, path, batch_size=IMPORT_BATCH_SIZE,
+                 log=print, warn=print, progress=None):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.log = log
+        self.warn = warn
+        self.progress = progress
+        self.id_maps = {}
+
+    def get_ids(self, model):
+        if model not in self.id_maps:
+            self.id_maps[model] = IdMap(model)
+        return self.id_maps[model]
+
+    def resolve(self, model, value, required=False):
+        name = model._meta.verbose_name
+        if not value:
+            if required:
+                raise ImportRowError(f'не указан id объекта «{name}»')
+            return None
+        pk = int(value)
+        if pk not in self.get_ids(model):
+            raise ImportRowError(f'нет объекта «{name}» с id {pk}')
+        return pk
+
+    def parse_date(self, value):
+        if not value:
+            return timezone.now()
+        date = parse_datetime(value)
+        if date is None:
+            raise ImportRowError(f'неверная дата {value}')
+        return date
+
+    def build(self, filename, model, builder):
+        exclude = [
+            field.name for field in model._meta.concrete_fields
+            if field.is_relation
+        ] + (['password'] if model is User else [])
+        ids = self.get_ids(model)
+        unique_keys = UniqueKeys(model)
+        for line, row in read_rows(self.path / filename):
+            try:
+                instance = builder(self, row)
+                instance.clean_fields(exclude=exclude)
+            except (ImportRowError, KeyError, TypeError, ValueError,
+                    ValidationError) as error:
+                self.warn(f'{filename}:{line}: {format_error(error)}')
+                continue
+            if instance.pk in ids:
+                self.warn(
+                    f'{filename}:{line}: запись с id {instance.pk} '
+                    'уже существует'
+                )
+                continue
+            fields = unique_keys.find_duplicate(instance)
+            if fields is not None:
+                self.warn(
+                    f'{filename}:{line}: запись с таким значением '
+                    f'{", ".join(fields)} уже существует'
+                )
+                continue
+            ids.add(instance.pk)
+            unique_keys.add(instance)
+            yield instance
+
+    def import_file(self, filename, model, builder):
+        started = time.monotonic()
+        count = 0
+        with keep_auto_now_add(model):
+            for batch in batched(
+                self.build(filename, model, builder), self.batch_size
+            ):
+                write_coordinator.run(
+                    lambda: model.objects.bulk_create(batch)
+                )
+                count += len(batch)
+                if self.progress is not None:
+                    self.progress(
+                        filename, count, time.monotonic() - started
+                    )
+        return count, time.monotonic() - started
+
+    def run(self):
+        total = 0
+        for filename, model, builder in IMPORT_FILES:
+            if not (self.path / filename).exists():
+                self.log(f'{filename}: файл не найден, пропущен')
+                continue
+            count, elapsed = self.import_file(filename, model, builder)
+            total += count
+            self.log(
+                f'{filename}: загружено {count} строк за {elapsed:.1f} с '
+                f'({count / max(elapsed, 1e-6):.0f} строк/с)'
+            )
+        Title.recompute_ratings()
+        catalog_imported.send(sender=self.__class__)
+        return total
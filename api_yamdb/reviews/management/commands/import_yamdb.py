@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from api_yamdb.constants import IMPORT_BATCH_SIZE
+from reviews.importer import CatalogImporter
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает категории, жанры, произведения, пользователей, отзывы '
+        'и комментарии из CSV-файлов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=settings.BASE_DIR / 'static' / 'data',
+            help='Папка с CSV-файлами'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+            help='Сколько строк вставлять одним запросом'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('Размер пакета должен быть положительным')
+        importer = CatalogImporter(
+            options['path'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+            warn=lambda message: self.stderr.write(
+                message, style_func=self.style.WARNING
+            ),
+            progress=self.progress if options['verbosity'] > 1 else None,
+        )
+        try:
+            total = importer.run()
+        except IntegrityError as error:
+            raise CommandError(f'Ошибка целостности данных: {error}')
+        self.stdout.write(
+            self.style.SUCCESS(f'Загрузка завершена, всего строк: {total}')
+        )
+
+    def progress(self, filename, count, elapsed):
+        self.stdout.write(
+            f'{filename}: {count} строк, '
+            f'{count / max(elapsed, 1e-6):.0f} строк/с'
+        )
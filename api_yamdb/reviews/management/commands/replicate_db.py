@@ -0,0 +1,38 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Копирует основную базу SQLite в файлы реплик'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', action='append', dest='replicas',
+            help='Реплика, которую нужно обновить (по умолчанию все)'
+        )
+
+    def handle(self, *args, **options):
+        replicas = options['replicas'] or settings.DATABASE_REPLICAS
+        if not replicas:
+            raise CommandError('Реплики не настроены')
+        source = connections[DEFAULT_DB_ALIAS]
+        for alias in (DEFAULT_DB_ALIAS, *replicas):
+            if alias not in connections.databases:
+                raise CommandError(f'Неизвестная база данных: {alias}')
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'База {alias} не использует SQLite')
+        source.ensure_connection()
+        for alias in replicas:
+            replica = connections[alias]
+            replica.close()
+            # Резервное копирование SQLite даёт согласованный снимок,
+            # даже если в основную базу в это время пишут.
+            target = sqlite3.connect(str(replica.settings_dict['NAME']))
+            try:
+                source.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(f'Реплика {alias} обновлена')
@@ -1,6 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.signals import post_save
+from django.utils import timezone
 
 from .validators import validate_year
 from api_yamdb.constants import MAX_NAME_LENGTH, MAX_LENGHT
@@ -76,17 +80,139 @@ class Title(models.Model):
         related_name='titles',
         null=True,
     )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False,
+    )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True
+    )
+
+    RATING_FIELDS = ('rating', 'review_count', 'score_sum')
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year'], name='title_year_idx'),
+        ]
 
     def __str__(self):
         return self.name[:MAX_LENGHT] + (
             '...' if len(self.name) > MAX_LENGHT else ''
         )
 
+    def save(self, *args, **kwargs):
+        # Агрегаты отзывов меняются только через update_rating, поэтому
+        # устаревший экземпляр не должен перезаписывать их при сохранении.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def update_rating(cls, title_id, score_delta, count_delta):
+        score_sum = F('score_sum') + score_delta
+        review_count = F('review_count') + count_delta
+        cls.objects.filter(pk=title_id).update(
+            score_sum=score_sum,
+            review_count=review_count,
+            rating=score_sum / NullIf(review_count, 0),
+            updated_at=timezone.now(),
+        )
+
+    def update_genres(self, genres, created=False):
+        # Меняются только связи, которых коснулось изменение: лишние
+        # удаляются одним запросом, недостающие добавляются пакетом.
+        through = self.genre.through
+        current = set() if created else set(
+            through.objects.filter(title=self).values_list(
+                'genre_id', flat=True
+            )
+        )
+        new = [genre.pk for genre in genres]
+        removed = current.difference(new)
+        if removed:
+            through.objects.filter(
+                title=self, genre_id__in=removed
+            ).delete()
+        added = [pk for pk in dict.fromkeys(new) if pk not in current]
+        if added:
+            through.objects.bulk_create([
+                through(title=self, genre_id=pk) for pk in added
+            ])
+        if removed or added:
+            getattr(self, '_prefetched_objects_cache', {}).pop('genre', None)
+
+    @classmethod
+    def recompute_ratings(cls):
+        # Пересчёт агрегатов по всем отзывам, например после загрузки
+        # данных в обход save().
+        reviews = Review.objects.filter(title=OuterRef('pk')).order_by()
+        reviews = reviews.values('title')
+        cls.objects.update(
+            review_count=Coalesce(
+                Subquery(reviews.annotate(value=Count('pk')).values('value')),
+                0
+            ),
+            score_sum=Coalesce(
+                Subquery(reviews.annotate(value=Sum('score')).values('value')),
+                0
+            ),
+            updated_at=timezone.now(),
+        )
+        cls.objects.update(
+            rating=F('score_sum') / NullIf(F('review_count'), 0)
+        )
+
+    @classmethod
+    def bulk_create_with_genres(cls, titles, genres):
+        # genres[i] — жанры произведения titles[i]. Произведения и связи
+        # с жанрами вставляются пакетами в одной транзакции.
+        using = cls.objects.db
+        features = connections[using].features
+        with transaction.atomic(using=using):
+            cls.objects.bulk_create(titles)
+            if not features.can_return_rows_from_bulk_insert:
+                # SQLite не возвращает id вставленных строк. Транзакция
+                # удерживает блокировку записи, поэтому новые строки
+                # получили последние id подряд.
+                ids = list(cls.objects.order_by('-pk').values_list(
+                    'pk', flat=True
+                )[:len(titles)])
+                for title, pk in zip(titles, reversed(ids)):
+                    title.pk = pk
+                    title._state.adding = False
+                    title._state.db = using
+            cls.genre.through.objects.bulk_create([
+                cls.genre.through(title_id=title.pk, genre_id=genre.pk)
+                for title, title_genres in zip(titles, genres)
+                for genre in title_genres
+            ])
+            for title in titles:
+                post_save.send(
+                    sender=cls, instance=title, created=True,
+                    update_fields=None, raw=False, using=using
+                )
+        return titles
+
 
 class Review(models.Model):
     title = models.ForeignKey(
@@ -113,6 +239,10 @@ class Review(models.Model):
         verbose_name='Дата добавления отзыва',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения отзыва',
+        auto_now=True
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -124,12 +254,47 @@ class Review(models.Model):
                 name='unique_review'
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:MAX_LENGHT] + (
             '...' if len(self.text) > MAX_LENGHT else ''
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rating = (
+            instance.__dict__.get('title_id'), instance.__dict__.get('score')
+        )
+        return instance
+
+    def _get_loaded_rating(self):
+        loaded = getattr(self, '_loaded_rating', None)
+        if loaded is None or None in loaded:
+            loaded = Review.objects.filter(pk=self.pk).values_list(
+                'title_id', 'score'
+            ).first()
+        return loaded
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            loaded = None if self._state.adding else self._get_loaded_rating()
+            super().save(*args, **kwargs)
+            if loaded is None:
+                Title.update_rating(self.title_id, self.score, 1)
+            elif loaded[0] != self.title_id:
+                Title.update_rating(loaded[0], -loaded[1], -1)
+                Title.update_rating(self.title_id, self.score, 1)
+            elif loaded[1] != self.score:
+                Title.update_rating(self.title_id, self.score - loaded[1], 0)
+        self._loaded_rating = (self.title_id, self.score)
+
 
 class Comment(models.Model):
     author = models.ForeignKey(
@@ -146,6 +311,10 @@ class Comment(models.Model):
         verbose_name='Дата добавления комментария',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения комментария',
+        auto_now=True
+    )
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
@@ -156,6 +325,12 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('pub_date',)
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:MAX_LENGHT] + (
@@ -0,0 +1,71 @@
+import random
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_state = Local()
+
+
+class RoutingScope:
+    # Маршрутизация в пределах одного запроса: реплика выбирается один раз,
+    # а после первой записи все чтения идут в основную базу.
+
+    def __init__(self, allow_replica):
+        self.allow_replica = allow_replica
+        self.replica = None
+        self.written = False
+
+    def db_for_read(self):
+        replicas = settings.DATABASE_REPLICAS
+        if not self.allow_replica or self.written or not replicas:
+            return DEFAULT_DB_ALIAS
+        if self.replica not in replicas:
+            self.replica = random.choice(replicas)
+        return self.replica
+
+
+@contextmanager
+def routing_scope(allow_replica):
+    previous = getattr(_state, 'scope', None)
+    scope = RoutingScope(allow_replica)
+    _state.scope = scope
+    try:
+        yield scope
+    finally:
+        _state.scope = previous
+
+
+def primary_reads():
+    # Данные для кешей читаются из основной базы: страница из отстающей
+    # реплики осталась бы в кеше и после того, как реплика догонит её.
+    return routing_scope(allow_replica=False)
+
+
+def get_routing_scope():
+    return getattr(_state, 'scope', None)
+
+
+class PrimaryReplicaRouter:
+    # Вне запроса (команды, shell, фоновые задачи) чтение идёт
+    # из основной базы.
+
+    def db_for_read(self, model, **hints):
+        scope = get_routing_scope()
+        if scope is None:
+            return DEFAULT_DB_ALIAS
+        return scope.db_for_read()
+
+    def db_for_write(self, model, **hints):
+        scope = get_routing_scope()
+        if scope is not None:
+            scope.written = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in databases and obj2._state.db in databases
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.DATABASE_REPLICAS
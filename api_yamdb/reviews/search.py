@@ -0,0 +1,108 @@
+import re
+
+from django.db import connections
+
+from api_yamdb.constants import SEARCH_RESULTS_LIMIT
+
+TITLE_INDEX = 'reviews_title_fts'
+REVIEW_INDEX = 'reviews_review_fts'
+
+# unicode61 приводит кириллицу к нижнему регистру, но не отождествляет
+# «ё» и «е», поэтому обе стороны поиска нормализуются одинаково.
+YO_REPLACEMENTS = (('ё', 'е'), ('Ё', 'Е'))
+
+
+def normalize_sql(column):
+    for old, new in YO_REPLACEMENTS:
+        column = f"replace({column}, '{old}', '{new}')"
+    return f"coalesce({column}, '')"
+
+
+def normalize(text):
+    for old, new in YO_REPLACEMENTS:
+        text = text.replace(old, new)
+    return text
+
+
+def index_statements(index, table, columns):
+    values = ', '.join(normalize_sql(f'new.{column}') for column in columns)
+    old_values = ', '.join(
+        normalize_sql(f'old.{column}') for column in columns
+    )
+    column_list = ', '.join(columns)
+    delete = (
+        f"INSERT INTO {index}({index}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert = (
+        f'INSERT INTO {index}(rowid, {column_list}) '
+        f'VALUES (new.id, {values});'
+    )
+    return (
+        f'CREATE VIRTUAL TABLE {index} USING fts5({column_list}, '
+        f"content='', tokenize='unicode61 remove_diacritics 2')",
+        f'CREATE TRIGGER {index}_ai AFTER INSERT ON {table} '
+        f'BEGIN {insert} END',
+        f'CREATE TRIGGER {index}_ad AFTER DELETE ON {table} '
+        f'BEGIN {delete} END',
+        f'CREATE TRIGGER {index}_au AFTER UPDATE OF {column_list} '
+        f'ON {table} BEGIN {delete} {insert} END',
+        f'INSERT INTO {index}(rowid, {column_list}) SELECT id, '
+        + ', '.join(normalize_sql(column) for column in columns)
+        + f' FROM {table}',
+    )
+
+
+SEARCH_INDEXES = (
+    (TITLE_INDEX, 'reviews_title', ('name', 'description')),
+    (REVIEW_INDEX, 'reviews_review', ('text',)),
+)
+
+
+def create_search_indexes(using='default', **kwargs):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        existing = connection.introspection.table_names(cursor)
+        for index, table, columns in SEARCH_INDEXES:
+            if index in existing or table not in existing:
+                continue
+            for statement in index_statements(index, table, columns):
+                cursor.execute(statement)
+
+
+def is_available(using='default'):
+    connection = connections[using]
+    return connection.vendor == 'sqlite'
+
+
+def make_match_query(query):
+    terms = re.findall(r'\w+', normalize(query))
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def match_sql(index):
+    return f'SELECT rowid FROM {index} WHERE {index} MATCH %s'
+
+
+def ranked_ids(index, query, limit=SEARCH_RESULTS_LIMIT, weights=()):
+    match_query = make_match_query(query)
+    if not match_query:
+        return []
+    rank = f"bm25({', '.join((index,) + tuple(map(str, weights)))})"
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            f'{match_sql(index)} ORDER BY {rank} LIMIT %s',
+            (match_query, limit)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_title_ids(query, limit=SEARCH_RESULTS_LIMIT):
+    # Совпадение в названии весит больше, чем в описании.
+    return ranked_ids(TITLE_INDEX, query, limit, weights=(10.0, 1.0))
+
+
+def search_review_ids(query, limit=SEARCH_RESULTS_LIMIT):
+    return ranked_ids(REVIEW_INDEX, query, limit)
@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .autocomplete import title_index
+from .models import Review, Title
+
+# Отправляется после загрузки данных в обход save() и сигналов моделей.
+catalog_imported = Signal()
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    Title.update_rating(instance.title_id, -instance.score, -1)
+    transaction.on_commit(
+        lambda: title_index.change_popularity(instance.title_id, -1)
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(
+            lambda: title_index.change_popularity(instance.title_id, 1)
+        )
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: title_index.update(instance.pk, instance.name)
+    )
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    # После удаления pk экземпляра обнуляется, а коммит внешней
+    # транзакции может наступить позже.
+    pk = instance.pk
+    transaction.on_commit(lambda: title_index.remove(pk))
+
+
+@receiver(catalog_imported)
+def reset_title_index(**kwargs):
+    title_index.clear()
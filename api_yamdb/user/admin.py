@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth import get_user_model
 
+from .models import OutboxEmail
+
 User = get_user_model()
 
 
@@ -31,4 +33,11 @@ class CustomUserAdmin(BaseUserAdmin):
     )
 
 
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'status', 'attempts', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('recipient',)
+
+
 admin.site.register(User, CustomUserAdmin)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api_yamdb.constants import (
+    OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, OUTBOX_POLL_INTERVAL
+)
+from user.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=OUTBOX_BATCH_SIZE,
+            help='Сколько писем выбирать из очереди за раз'
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=OUTBOX_MAX_ATTEMPTS,
+            help='Сколько раз пытаться отправить письмо'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=OUTBOX_POLL_INTERVAL,
+            help='Пауза между проверками очереди, в секундах'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить накопившиеся письма и завершить работу'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            # Долго работающий обработчик сам закрывает устаревшие
+            # соединения с базой, как это делает Django после запроса.
+            close_old_connections()
+            processed, sent = send_pending(
+                options['batch_size'], options['max_attempts']
+            )
+            if processed:
+                self.stdout.write(
+                    f'Обработано писем: {processed}, отправлено: {sent}'
+                )
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -1,11 +1,15 @@
+from hashlib import md5
+
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 
 
 from api_yamdb.constants import (
-    MAX_ROLE_LENGHT, MAX_USERNAME_LENGHT, MAX_EMAIL_LENGTH
+    MAX_ROLE_LENGHT, MAX_STATUS_LENGTH, MAX_SUBJECT_LENGTH,
+    MAX_USERNAME_LENGHT, MAX_EMAIL_LENGTH
 )
 
 
@@ -65,3 +69,92 @@ class User(AbstractUser):
     @property
     def is_admin(self):
         return self.role == self.ADMIN
+
+
+class OutboxEmail(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    ]
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=MAX_EMAIL_LENGTH,
+    )
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=MAX_SUBJECT_LENGTH,
+    )
+    body = models.TextField(
+        verbose_name='Текст письма',
+    )
+    dedup_key = models.CharField(
+        verbose_name='Ключ объединения',
+        max_length=32,
+        editable=False,
+    )
+    status = models.CharField(
+        verbose_name='Статус',
+        max_length=MAX_STATUS_LENGTH,
+        choices=STATUSES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток отправки',
+        default=0,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now,
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedup_key'],
+                condition=models.Q(status='pending'),
+                name='unique_pending_email'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outbox_due_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+    @classmethod
+    def enqueue(cls, recipient, subject, body):
+        # Повторное письмо с той же темой тому же адресату, пока прежнее
+        # ещё не отправлено, не ставится в очередь.
+        dedup_key = md5(f'{recipient}|{subject}'.encode()).hexdigest()
+        try:
+            with transaction.atomic():
+                return cls.objects.create(
+                    recipient=recipient, subject=subject, body=body,
+                    dedup_key=dedup_key,
+                )
+        except IntegrityError:
+            return None
@@ -0,0 +1,75 @@
+from contextlib import suppress
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from api_yamdb.constants import (
+    OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, OUTBOX_MAX_RETRY_DELAY,
+    OUTBOX_RETRY_DELAY
+)
+from reviews.database import write_coordinator
+from .models import OutboxEmail
+
+
+def get_retry_delay(attempts):
+    return timedelta(seconds=min(
+        OUTBOX_RETRY_DELAY * 2 ** (attempts - 1), OUTBOX_MAX_RETRY_DELAY
+    ))
+
+
+def send_batch(connection, batch_size=OUTBOX_BATCH_SIZE,
+               max_attempts=OUTBOX_MAX_ATTEMPTS):
+    emails = list(OutboxEmail.objects.filter(
+        status=OutboxEmail.PENDING, next_attempt_at__lte=timezone.now()
+    ).order_by('next_attempt_at', 'id')[:batch_size])
+    sent = 0
+    for email in emails:
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=(email.recipient,),
+            connection=connection,
+        )
+        email.attempts += 1
+        try:
+            message.send()
+        except Exception as error:
+            # Соединение могло оборваться: открываем новое, чтобы следующие
+            # письма снова шли через одно соединение. Если сервер всё ещё
+            # недоступен, ошибку получит следующее письмо.
+            connection.close()
+            with suppress(Exception):
+                connection.open()
+            email.last_error = repr(error)
+            if email.attempts >= max_attempts:
+                email.status = OutboxEmail.FAILED
+            else:
+                email.next_attempt_at = (
+                    timezone.now() + get_retry_delay(email.attempts)
+                )
+        else:
+            email.status = OutboxEmail.SENT
+            email.sent_at = timezone.now()
+            sent += 1
+        write_coordinator.run(lambda: email.save(update_fields=(
+            'attempts', 'last_error', 'status', 'next_attempt_at', 'sent_at'
+        )))
+    return len(emails), sent
+
+
+def send_pending(batch_size=OUTBOX_BATCH_SIZE,
+                 max_attempts=OUTBOX_MAX_ATTEMPTS):
+    # Все пачки отправляются через одно соединение с почтовым сервером.
+    processed = sent = 0
+    with get_connection() as connection:
+        while True:
+            batch_processed, batch_sent = send_batch(
+                connection, batch_size, max_attempts
+            )
+            processed += batch_processed
+            sent += batch_sent
+            if batch_processed < batch_size:
+                return processed, sent
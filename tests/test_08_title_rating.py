@@ -0,0 +1,78 @@
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, client, title_id):
+        return client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        ).json()
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client, moderator):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        review = create_single_review(
+            user_client, title_id, 'Неплохо', 5
+        ).json()
+        create_single_review(moderator_client, title_id, 'Так себе', 3)
+        title = self.get_title(admin_client, title_id)
+        assert title['rating'] == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            ),
+            data={'score': 8}
+        )
+        title = self.get_title(admin_client, title_id)
+        assert title['rating'] == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        moderator.delete()
+        title = self.get_title(admin_client, title_id)
+        assert title['rating'] == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'каскадном удалении отзывов вместе с автором.'
+        )
+
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            )
+        )
+        title = self.get_title(admin_client, title_id)
+        assert title['rating'] == 10, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_title_update_keeps_rating(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Неплохо', 5)
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            data={'name': 'Терминатор 2'}
+        )
+        title = self.get_title(admin_client, title_id)
+        assert title['rating'] == 5, (
+            'Проверьте, что изменение произведения не сбрасывает его '
+            'рейтинг.'
+        )
@@ -0,0 +1,101 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.views import TitleViewSet
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Queries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def create_titles(self, count):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name='Ужасы', slug='horror'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        titles = []
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+            titles.append(title)
+        return titles
+
+    @pytest.mark.parametrize('page_size', (1, 10, 100))
+    def test_01_titles_list_query_count(self, client, monkeypatch,
+                                        page_size):
+        monkeypatch.setattr(
+            TitleViewSet.pagination_class, 'page_size', page_size
+        )
+        self.create_titles(page_size)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == page_size
+        assert len(context.captured_queries) == 4, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет '
+            'фиксированное число запросов к базе данных независимо от '
+            'размера страницы.'
+        )
+
+    def test_02_title_detail_query_count(self, client):
+        title = self.create_titles(1)[0]
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id))
+        assert len(context.captured_queries) == 3, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` загружает жанры и категорию '
+            'без дополнительных запросов.'
+        )
+
+    def create_reviews(self, django_user_model, count):
+        title = self.create_titles(1)[0]
+        reviews = []
+        for idx in range(count):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            reviews.append(Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            ))
+            Comment.objects.create(
+                review=reviews[0], author=author, text='Комментарий'
+            )
+        return title, reviews
+
+    def test_03_reviews_list_query_count(self, client, django_user_model):
+        title, _ = self.create_reviews(django_user_model, 5)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.json()['results'][0]['title'] == title.name
+        assert len(context.captured_queries) == 4, (
+            f'Проверьте, что GET-запрос к `{self.REVIEWS_URL_TEMPLATE}` '
+            'загружает авторов и произведение одним запросом.'
+        )
+
+    def test_04_comments_list_query_count(self, client, django_user_model):
+        title, reviews = self.create_reviews(django_user_model, 5)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=reviews[0].id
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.json()['results'][0]['review'] == reviews[0].id, (
+            f'Проверьте, что в ответе на GET-запрос к '
+            f'`{self.COMMENTS_URL_TEMPLATE}` поле `review` содержит id '
+            'отзыва.'
+        )
+        assert len(context.captured_queries) == 4, (
+            f'Проверьте, что GET-запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+            'загружает авторов комментариев одним запросом.'
+        )
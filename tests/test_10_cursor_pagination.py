@@ -0,0 +1,63 @@
+import pytest
+
+from reviews.models import Category, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def collect(self, client, url):
+        results = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не выполняет подсчёт '
+                'всех объектов.'
+            )
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    def test_01_titles_cursor_pagination(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        ids = [
+            Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            ).id
+            for idx in range(25)
+        ]
+
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == 25, (
+            f'Проверьте, что по умолчанию `{self.TITLES_URL}` использует '
+            'постраничную пагинацию.'
+        )
+
+        results = self.collect(client, f'{self.TITLES_URL}?pagination=cursor')
+        assert [title['id'] for title in results] == ids, (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения по порядку без повторов.'
+        )
+
+    def test_02_reviews_cursor_pagination(self, client, admin_client, admin,
+                                          user_client, user,
+                                          moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        results = self.collect(client, f'{url}?pagination=cursor')
+        assert [review['id'] for review in results] == [
+            review['id'] for review in reviews
+        ], (
+            f'Проверьте, что курсорная пагинация `{self.REVIEWS_URL_TEMPLATE}` '
+            'возвращает отзывы в порядке публикации.'
+        )
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+def get_query_plans(client, url, table):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    plans = []
+    for query in context.captured_queries:
+        if f'FROM "{table}"' not in query['sql']:
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'EXPLAIN QUERY PLAN ' + query['sql'].replace('%', '%%')
+            )
+            plans.append([row[-1] for row in cursor.fetchall()])
+    return plans
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11QueryPlans:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_list_endpoints_use_indexes(self, client, admin_client, admin,
+                                           user_client, user):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+        }
+        _, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        endpoints = (
+            (reviews_url, 'reviews_review'),
+            (f'{reviews_url}?pagination=cursor', 'reviews_review'),
+            (comments_url, 'reviews_comment'),
+            (f'{comments_url}?pagination=cursor', 'reviews_comment'),
+            (f'{self.TITLES_URL}?year=1984', 'reviews_title'),
+        )
+        for url, table in endpoints:
+            plans = get_query_plans(client, url, table)
+            assert plans, f'Запрос к `{url}` не обращается к `{table}`.'
+            for plan in plans:
+                assert f'SCAN {table}' not in plan, (
+                    f'Проверьте, что запрос к `{url}` использует индекс, '
+                    f'а не полный просмотр таблицы `{table}`: {plan}'
+                )
+                assert not any('TEMP B-TREE' in step for step in plan), (
+                    f'Проверьте, что запрос к `{url}` получает строки '
+                    f'из индекса в нужном порядке без сортировки: {plan}'
+                )
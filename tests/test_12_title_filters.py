@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_ids(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        return sorted(title['id'] for title in response.json()['results'])
+
+    def test_01_genre_filters(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+
+        assert self.get_ids(client, 'genre=horror') == [terminator]
+        assert self.get_ids(client, 'genre=hor') == [], (
+            'Проверьте, что фильтр `genre` сравнивает слаг жанра целиком.'
+        )
+        assert self.get_ids(client, 'genre__icontains=o') == [terminator], (
+            'Проверьте, что фильтр `genre__icontains` ищет подстроку в слаге '
+            'жанра и не дублирует произведения.'
+        )
+        assert self.get_ids(client, 'genre=horror,drama') == [
+            terminator, die_hard
+        ]
+        assert self.get_ids(
+            client, 'genre=horror,comedy&genre_mode=and'
+        ) == [terminator]
+        assert self.get_ids(
+            client, 'genre=horror,drama&genre_mode=and'
+        ) == []
+
+    def test_02_category_filters(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+
+        assert self.get_ids(client, 'category=films') == [titles[0]['id']]
+        assert self.get_ids(client, 'category=film') == []
+        assert self.get_ids(client, 'category__icontains=film') == [
+            titles[0]['id']
+        ]
+
+    def test_03_genre_filter_single_query(self, client, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            client.get(
+                f'{self.TITLES_URL}?genre=horror,comedy&genre_mode=and'
+            )
+        assert len(context.captured_queries) == 4, (
+            'Проверьте, что фильтр по нескольким жанрам выполняется '
+            'одним запросом.'
+        )
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Search:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    SEARCH_URL = '/api/v1/search/'
+
+    def test_01_titles_search(self, client, admin_client, admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+
+        response = client.get(f'{self.TITLES_URL}?search=ТЕРМИНАТ')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ], (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет произведения по началу слова без учёта регистра.'
+        )
+        response = client.get(f'{self.TITLES_URL}?search=back')
+        assert response.json()['count'] == 1, (
+            f'Проверьте, что параметр `search` эндпоинта `{self.TITLES_URL}` '
+            'ищет и по описанию произведения.'
+        )
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'name': 'Ёжик в тумане'}
+        )
+        response = client.get(f'{self.TITLES_URL}?search=ежик')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id']
+        ], (
+            'Проверьте, что поиск обновляется при изменении произведения '
+            'и не различает «е» и «ё».'
+        )
+        response = client.get(f'{self.TITLES_URL}?search=орешек')
+        assert response.json()['count'] == 0
+
+    def test_02_search_endpoint(self, client, admin_client, admin,
+                                user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+
+        response = client.get(f'{self.SEARCH_URL}?q=review number 2')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.SEARCH_URL}` не найден или недоступен '
+            'неавторизованному пользователю.'
+        )
+        data = response.json()
+        assert [review['id'] for review in data['reviews']] == [
+            reviews[1]['id']
+        ]
+        assert data['titles'] == []
+
+        response = client.get(f'{self.SEARCH_URL}?q=review')
+        assert len(response.json()['reviews']) == 2
+
+        admin_client.delete(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        response = client.get(f'{self.SEARCH_URL}?q=review')
+        assert response.json()['reviews'] == [], (
+            'Проверьте, что удалённые отзывы исключаются из поиска.'
+        )
@@ -0,0 +1,121 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews import autocomplete
+from reviews.models import Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Autocomplete:
+
+    AUTOCOMPLETE_URL = '/api/v1/titles/autocomplete/'
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_names(self, client, query):
+        response = client.get(f'{self.AUTOCOMPLETE_URL}?q={query}')
+        return [title['name'] for title in response.json()]
+
+    def test_01_autocomplete(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Крёстный отец',
+            'year': 1972,
+            'genre': ['drama'],
+            'category': 'films',
+        })
+
+        assert self.get_names(client, 'КР') == [
+            'Крепкий орешек', 'Крёстный отец'
+        ], (
+            f'Проверьте, что `{self.AUTOCOMPLETE_URL}` ищет названия по '
+            'началу строки без учёта регистра.'
+        )
+        assert self.get_names(client, 'крес') == ['Крёстный отец']
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'name': 'Терминатор 2'}
+        )
+        assert self.get_names(client, 'кр') == ['Крёстный отец']
+        assert self.get_names(client, 'терм') == [
+            'Терминатор', 'Терминатор 2'
+        ], (
+            'Проверьте, что подсказки упорядочены по числу отзывов.'
+        )
+
+        admin_client.delete(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        with CaptureQueriesContext(connection) as context:
+            names = self.get_names(client, 'терм')
+        assert names == ['Терминатор 2']
+        assert not context.captured_queries, (
+            f'Проверьте, что `{self.AUTOCOMPLETE_URL}` не обращается '
+            'к базе данных.'
+        )
+
+    def test_02_changes_from_other_processes(self, client, admin_client,
+                                             admin, monkeypatch):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        assert self.get_names(client, 'терм') == ['Терминатор']
+
+        # Изменение, сделанное другим процессом: в обход сигналов этого
+        # процесса, но с увеличением общей версии индекса.
+        Title.objects.filter(pk=titles[0]['id']).update(name='Термит')
+        autocomplete.bump_shared_version()
+        assert self.get_names(client, 'терм') == ['Терминатор'], (
+            'Проверьте, что общая версия проверяется не на каждый запрос.'
+        )
+        monkeypatch.setattr(
+            autocomplete, 'AUTOCOMPLETE_VERSION_CHECK_INTERVAL', 0
+        )
+        assert self.get_names(client, 'терм') == ['Термит'], (
+            'Проверьте, что индекс подсказок перестраивается, когда '
+            'произведения изменены в другом процессе.'
+        )
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'name': 'Терминатор'}
+        )
+        with CaptureQueriesContext(connection) as context:
+            assert self.get_names(client, 'терм') == ['Терминатор']
+        assert not context.captured_queries, (
+            'Проверьте, что собственные изменения процесса не вызывают '
+            'перестройку индекса.'
+        )
+
+    def test_03_short_prefix_without_scan(self, monkeypatch):
+        index = autocomplete.TitlePrefixIndex()
+        index.load([
+            (pk, f'Терминатор {pk}', pk % 3) for pk in range(1, 30)
+        ])
+
+        def scan(*args, **kwargs):
+            raise AssertionError(
+                'Проверьте, что подсказки для коротких префиксов берутся из '
+                'готовых списков, без перебора совпадений.'
+            )
+
+        monkeypatch.setattr(autocomplete.heapq, 'nsmallest', scan)
+        monkeypatch.setattr(index, '_ensure_fresh', lambda: None)
+        names = [title['name'] for title in index.search('т', 3)]
+        assert names == ['Терминатор 11', 'Терминатор 14', 'Терминатор 17']
+
+        index.change_popularity(1, 5)
+        index.update(100, 'Титаник', 3)
+        assert [title['id'] for title in index.search('т', 4)] == [
+            1, 100, 11, 14
+        ], 'Проверьте, что готовые списки подсказок обновляются.'
+
+        monkeypatch.undo()
+        monkeypatch.setattr(index, '_ensure_fresh', lambda: None)
+        index.remove(14)
+        index.change_popularity(1, -5)
+        assert [title['id'] for title in index.search('т', 4)] == [
+            100, 11, 17, 2
+        ]
+        assert [title['id'] for title in index.search('ти')] == [100]
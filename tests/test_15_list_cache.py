@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ListCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def get_slugs(self, client, url):
+        return [obj['slug'] for obj in client.get(url).json()['results']]
+
+    def test_01_categories_cache(self, client, admin_client):
+        create_categories(admin_client)
+        assert self.get_slugs(client, self.CATEGORIES_URL) == [
+            'books', 'films'
+        ]
+        with CaptureQueriesContext(connection) as context:
+            assert self.get_slugs(client, self.CATEGORIES_URL) == [
+                'books', 'films'
+            ]
+        assert not context.captured_queries, (
+            f'Проверьте, что повторный GET-запрос к `{self.CATEGORIES_URL}` '
+            'отдаётся из кеша.'
+        )
+        assert self.get_slugs(
+            client, f'{self.CATEGORIES_URL}?search=Книги'
+        ) == ['books']
+
+        admin_client.delete(f'{self.CATEGORIES_URL}films/')
+        assert self.get_slugs(client, self.CATEGORIES_URL) == ['books'], (
+            'Проверьте, что удаление категории сбрасывает кеш списка.'
+        )
+        Category.objects.create(name='Музыка', slug='music')
+        assert self.get_slugs(client, self.CATEGORIES_URL) == [
+            'books', 'music'
+        ], (
+            'Проверьте, что создание категории вне API сбрасывает кеш списка.'
+        )
+
+    def test_02_genres_cache(self, client, admin_client):
+        create_genre(admin_client)
+        assert self.get_slugs(client, self.GENRES_URL) == [
+            'drama', 'comedy', 'horror'
+        ]
+        Genre.objects.filter(slug='drama').delete()
+        assert self.get_slugs(client, self.GENRES_URL) == [
+            'comedy', 'horror'
+        ], (
+            'Проверьте, что удаление жанра сбрасывает кеш списка.'
+        )
@@ -0,0 +1,203 @@
+from contextlib import contextmanager
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+
+from tests.utils import (create_comments, create_single_review,
+                         create_titles)
+
+
+@contextmanager
+def one_second_later():
+    # Last-Modified отдаётся только после окончания секунды изменения.
+    now = timezone.now
+    with mock.patch.object(
+        timezone, 'now', lambda: now() + timedelta(seconds=1)
+    ):
+        yield
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            cached = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert len(context.captured_queries) == 1
+        with one_second_later():
+            later = client.get(url)
+            assert later.has_header('Last-Modified'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовок `Last-Modified`.'
+            )
+            cached = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=later['Last-Modified']
+            )
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-Modified-Since` возвращает ответ со статусом 304.'
+        )
+        return response['ETag']
+
+    def test_01_conditional_get(self, client, admin_client, admin,
+                                user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id = titles[0]['id']
+        urls = (
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+        )
+        etags = [self.check_not_modified(client, url) for url in urls]
+
+        create_single_review(user_client, title_id, 'Неплохо', 5)
+        for url, etag in zip(urls[:2], etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после нового отзыва GET-запрос к `{url}` '
+                'со старым `If-None-Match` возвращает ответ со статусом 200.'
+            )
+
+        admin_client.delete(self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id'],
+            comment_id=comments[0]['id']
+        ))
+        response = client.get(urls[2], HTTP_IF_NONE_MATCH=etags[2])
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления комментария GET-запрос к '
+            f'`{self.COMMENTS_URL_TEMPLATE}` со старым `If-None-Match` '
+            'возвращает ответ со статусом 200.'
+        )
+
+    def check_modified(self, client, url, etag, message):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, message
+        return response
+
+    def test_02_category_and_genre_deletion(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title = titles[0]
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title['id'])
+        list_url = '/api/v1/titles/'
+        etag = self.check_not_modified(client, url)
+        list_etag = self.check_not_modified(client, list_url)
+
+        admin_client.delete(f'/api/v1/categories/{title["category"]}/')
+        response = self.check_modified(client, url, etag, (
+            'Проверьте, что после удаления категории GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` со старым `If-None-Match` '
+            'возвращает ответ со статусом 200.'
+        ))
+        assert response.json()['category'] is None
+        self.check_modified(client, list_url, list_etag, (
+            'Проверьте, что после удаления категории меняется ETag списка '
+            'произведений.'
+        ))
+
+        etag = response['ETag']
+        admin_client.delete(f'/api/v1/genres/{title["genre"][0]}/')
+        response = self.check_modified(client, url, etag, (
+            'Проверьте, что после удаления жанра GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` со старым `If-None-Match` '
+            'возвращает ответ со статусом 200.'
+        ))
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            title['genre'][1]
+        ]
+
+    def test_03_review_list_follows_title_and_author(self, client,
+                                                     admin_client, admin,
+                                                     user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Неплохо', 5)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        etag = self.check_not_modified(client, url)
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            data={'name': 'Терминатор 2'}
+        )
+        response = self.check_modified(client, url, etag, (
+            'Проверьте, что после переименования произведения GET-запрос к '
+            f'`{self.REVIEWS_URL_TEMPLATE}` со старым `If-None-Match` '
+            'возвращает ответ со статусом 200.'
+        ))
+        assert response.json()['results'][0]['title'] == 'Терминатор 2'
+
+        etag = response['ETag']
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        response = self.check_modified(client, url, etag, (
+            'Проверьте, что после смены имени автора GET-запрос к '
+            f'`{self.REVIEWS_URL_TEMPLATE}` со старым `If-None-Match` '
+            'возвращает ответ со статусом 200.'
+        ))
+        assert response.json()['results'][0]['author'] == 'renamed'
+
+    def test_04_invalid_lookup(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        urls = (
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id='abc'),
+            self.REVIEWS_URL_TEMPLATE.format(title_id='abc'),
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+            + 'abc/',
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с неверным id '
+                'возвращает ответ со статусом 404.'
+            )
+
+    def test_05_no_stale_not_modified(self, client, admin_client,
+                                      user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что `Last-Modified` не отдаётся, пока не закончилась '
+            'секунда последнего изменения.'
+        )
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 10)
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=http_date(int(
+                timezone.now().timestamp()
+            ))
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение в ту же секунду не даёт ответа 304 '
+            'по `If-Modified-Since`.'
+        )
+        assert response.json()['rating'] == 10
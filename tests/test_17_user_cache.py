@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17UserCache:
+
+    ME_URL = '/api/v1/users/me/'
+    USERS_URL = '/api/v1/users/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_authenticated_read_uses_cache(self, user_client):
+        user_client.get(self.ME_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert not context.captured_queries, (
+            'Проверьте, что повторный запрос авторизованного пользователя '
+            'не загружает пользователя из базы данных.'
+        )
+
+    def test_02_role_change_invalidates_cache(self, admin_client, user,
+                                              user_client):
+        data = {'name': 'Фильм', 'slug': 'films'}
+        response = user_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        response = user_client.post(self.CATEGORIES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что смена роли пользователя сразу сбрасывает его '
+            'запись в кеше аутентификации.'
+        )
+
+    def test_03_deactivation_invalidates_cache(self, user, user_client):
+        assert user_client.get(self.ME_URL).status_code == HTTPStatus.OK
+        user.is_active = False
+        user.save()
+        response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что деактивированный пользователь сразу теряет '
+            'доступ.'
+        )
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@pytest.fixture
+def role_claims(settings):
+    settings.JWT_ROLE_CLAIMS = True
+    cache.clear()
+
+
+def get_token_client(client, user):
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK, (
+        'Проверьте, что POST-запрос к `/api/v1/auth/token/` с верным кодом '
+        'подтверждения возвращает токен.'
+    )
+    token = response.json()['token']
+    token_client = APIClient()
+    token_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return token_client, AccessToken(token)
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'FROM "user_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18RoleClaims:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    ME_URL = '/api/v1/users/me/'
+
+    def test_01_token_carries_role(self, role_claims, client, admin):
+        _, token = get_token_client(client, admin)
+        assert token['role'] == 'admin'
+        assert token['username'] == admin.username
+        assert token['is_superuser'] is False
+
+    def test_02_permissions_without_user_query(self, role_claims, client,
+                                               admin):
+        admin_client, _ = get_token_client(client, admin)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not user_queries(context), (
+            'Проверьте, что проверка прав по токену с ролью не загружает '
+            'пользователя из базы данных.'
+        )
+        response = admin_client.get(self.ME_URL)
+        assert response.json()['email'] == admin.email, (
+            'Проверьте, что представления, которым нужен пользователь, '
+            'получают его из базы данных.'
+        )
+
+    def test_03_demotion_revokes_token(self, role_claims, client, admin):
+        admin_client, _ = get_token_client(client, admin)
+        admin.role = 'user'
+        admin.save()
+        response = admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли старый токен отзывается.'
+        )
+        user_client, _ = get_token_client(client, admin)
+        response = user_client.post(
+            self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_me_patch_changes_claim(self, role_claims, client, user):
+        user_client, _ = get_token_client(client, user)
+        response = user_client.patch(self.ME_URL, data={'username': 'bob'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['username'] == 'bob', (
+            f'Проверьте, что PATCH-запрос к `{self.ME_URL}` возвращает '
+            'сохранённое имя, а не имя из токена.'
+        )
+        response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена имени не отзывает токен: права '
+            'пользователя не изменились.'
+        )
+        assert response.json()['username'] == 'bob'
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE SAVEPOINT')
+QUERY_BUDGET = {
+    'PATCH': 5,
+    'DELETE': 5,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19PermissionQueries:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+
+    def check_budget(self, client, method, url, expected_status, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method.lower())(url, data=data)
+        assert response.status_code == expected_status
+        assert not any(
+            'FROM "user_user"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что при {method}-запросе к `{url}` автор объекта '
+            'не загружается для проверки прав.'
+        )
+        queries = [
+            query for query in context.captured_queries
+            if not query['sql'].startswith(TRANSACTION_STATEMENTS)
+        ]
+        assert len(queries) <= QUERY_BUDGET[method], (
+            f'Проверьте, что {method}-запрос к `{url}` укладывается в '
+            f'{QUERY_BUDGET[method]} запросов к базе данных.'
+        )
+
+    def test_01_review_and_comment_budget(self, admin_client, admin,
+                                          user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        comment_url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id'],
+            comment_id=comments[0]['id']
+        )
+        self.check_budget(
+            user_client, 'PATCH', comment_url, HTTPStatus.OK,
+            {'text': 'Новый текст'}
+        )
+        self.check_budget(
+            user_client, 'PATCH', review_url, HTTPStatus.OK, {'score': 7}
+        )
+        self.check_budget(
+            user_client, 'DELETE', comment_url, HTTPStatus.NO_CONTENT
+        )
+        self.check_budget(
+            user_client, 'DELETE', review_url, HTTPStatus.NO_CONTENT
+        )
@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20NestedResources:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+
+    def test_01_review_must_belong_to_title(self, client, admin_client,
+                                            admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        wrong_title_id = titles[1]['id']
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=wrong_title_id, review_id=reviews[0]['id']
+        )
+        detail_url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=wrong_title_id, review_id=reviews[0]['id'],
+            comment_id=comments[0]['id']
+        )
+        responses = (
+            client.get(url),
+            client.get(detail_url),
+            admin_client.post(url, data={'text': 'Комментарий'}),
+            admin_client.patch(detail_url, data={'text': 'Комментарий'}),
+            admin_client.delete(detail_url),
+        )
+        for response in responses:
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что запросы к '
+                f'`{self.COMMENTS_URL_TEMPLATE}` возвращают ответ со '
+                'статусом 404, если отзыв не относится к произведению.'
+            )
+
+    def test_02_parent_resolved_once(self, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
+        review_queries = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+        ]
+        assert len(review_queries) == 1, (
+            'Проверьте, что отзыв и произведение загружаются одним '
+            'запросом за время обработки запроса.'
+        )
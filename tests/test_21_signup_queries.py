@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.views import UserSignUpAPIView
+
+
+def user_selects(context):
+    return [
+        query for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "user_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21SignupQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_single_lookup(self, client, user):
+        cases = (
+            ({'username': 'new_user', 'email': 'new@yamdb.fake'},
+             HTTPStatus.OK),
+            ({'username': user.username, 'email': user.email},
+             HTTPStatus.OK),
+            ({'username': user.username, 'email': 'other@yamdb.fake'},
+             HTTPStatus.BAD_REQUEST),
+            ({'username': 'other_user', 'email': user.email},
+             HTTPStatus.BAD_REQUEST),
+        )
+        for data, expected_status in cases:
+            with CaptureQueriesContext(connection) as context:
+                response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == expected_status
+            assert len(user_selects(context)) == 1, (
+                f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` ищет '
+                'пользователя одним запросом.'
+            )
+
+    def test_02_concurrent_signup(self, client, user, monkeypatch):
+        get_existing_user = UserSignUpAPIView.get_existing_user
+        calls = []
+
+        def first_lookup_misses(username, email):
+            calls.append(username)
+            if len(calls) == 1:
+                return None
+            return get_existing_user(username, email)
+
+        monkeypatch.setattr(
+            UserSignUpAPIView, 'get_existing_user',
+            staticmethod(first_lookup_misses)
+        )
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'username': user.username, 'email': user.email}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что регистрация, проигравшая гонку за уникальные '
+            'поля, повторно отправляет код существующему пользователю.'
+        )
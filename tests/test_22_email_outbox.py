@@ -0,0 +1,116 @@
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from user.models import OutboxEmail
+from user.outbox import send_pending
+
+
+class FlakyBackend(BaseEmailBackend):
+    # Как SMTP: без открытого соединения send_messages открывает своё
+    # и закрывает его после отправки.
+    opened = 0
+    failures = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection = None
+
+    def open(self):
+        if self.connection is not None:
+            return False
+        FlakyBackend.opened += 1
+        self.connection = object()
+        return True
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, messages):
+        created = self.open()
+        try:
+            if FlakyBackend.failures:
+                FlakyBackend.failures -= 1
+                raise ConnectionError('Соединение оборвалось')
+            return len(messages)
+        finally:
+            if created:
+                self.close()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_enqueues_single_email(self, client):
+        valid_data = {
+            'email': 'valid@yamdb.fake',
+            'username': 'valid_username'
+        }
+        outbox_before_count = len(mail.outbox)
+        client.post(self.URL_SIGNUP, data=valid_data)
+        client.post(self.URL_SIGNUP, data=valid_data)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` только ставит '
+            'письмо в очередь, не отправляя его.'
+        )
+        assert OutboxEmail.objects.count() == 1, (
+            'Проверьте, что повторные письма тому же адресату, ожидающие '
+            'отправки, объединяются.'
+        )
+
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == [valid_data['email']]
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.SENT
+
+        client.post(self.URL_SIGNUP, data=valid_data)
+        assert OutboxEmail.objects.filter(
+            status=OutboxEmail.PENDING
+        ).count() == 1, (
+            'Проверьте, что после отправки письма новое письмо тому же '
+            'адресату снова ставится в очередь.'
+        )
+
+    def test_02_failed_email_is_retried(self, monkeypatch):
+        OutboxEmail.enqueue('valid@yamdb.fake', 'Тема', 'Текст')
+
+        def fail(self):
+            raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(EmailMessage, 'send', fail)
+        assert send_pending(max_attempts=2) == (1, 0)
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmail.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается на '
+            'следующую попытку.'
+        )
+        assert send_pending(max_attempts=2) == (0, 0)
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        send_pending(max_attempts=2)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.FAILED, (
+            'Проверьте, что после исчерпания попыток письмо помечается '
+            'как неотправленное.'
+        )
+
+    def test_03_connection_reopened_after_failure(self, settings,
+                                                  monkeypatch):
+        settings.EMAIL_BACKEND = 'tests.test_22_email_outbox.FlakyBackend'
+        monkeypatch.setattr(FlakyBackend, 'opened', 0)
+        monkeypatch.setattr(FlakyBackend, 'failures', 1)
+        for idx in range(4):
+            OutboxEmail.enqueue(f'user{idx}@yamdb.fake', 'Тема', 'Текст')
+        assert send_pending() == (4, 3)
+        assert FlakyBackend.opened == 2, (
+            'Проверьте, что после ошибки отправки соединение с почтовым '
+            'сервером открывается заново и используется для следующих писем.'
+        )
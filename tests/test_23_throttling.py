@@ -0,0 +1,160 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1 import views
+from api.v1.throttling import TokenBucketThrottle
+from tests.utils import create_titles
+
+
+def set_rates(settings, **rates):
+    settings.REST_FRAMEWORK = dict(
+        settings.REST_FRAMEWORK,
+        DEFAULT_THROTTLE_RATES=dict(
+            settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates
+        )
+    )
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def check_rejected_cheaply(self, request):
+        with CaptureQueriesContext(connection) as context:
+            response = request()
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запрос сверх лимита отклоняется '
+            'со статусом 429.'
+        )
+        assert 'Retry-After' in response, (
+            'Проверьте, что отклонённый запрос содержит заголовок '
+            '`Retry-After`.'
+        )
+        assert not context.captured_queries, (
+            'Проверьте, что отклонённый запрос не обращается к базе данных.'
+        )
+        return response
+
+    def test_01_signup_ip_limit(self, client, settings, monkeypatch):
+        set_rates(settings, auth_ip='3/min')
+        for number in range(3):
+            response = client.post(self.URL_SIGNUP, data={
+                'username': f'user_{number}',
+                'email': f'user_{number}@yamdb.fake'
+            })
+            assert response.status_code == HTTPStatus.OK
+
+        def serializer_not_expected(*args, **kwargs):
+            raise AssertionError('Сериализатор не должен создаваться.')
+
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                views, 'UserSignUpSerializer', serializer_not_expected
+            )
+            self.check_rejected_cheaply(lambda: client.post(
+                self.URL_SIGNUP,
+                data={'username': 'user_4', 'email': 'user_4@yamdb.fake'}
+            ))
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'username': 'user_5', 'email': 'user_5@yamdb.fake'},
+            REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что лимит по IP-адресу учитывается для каждого '
+            'адреса отдельно.'
+        )
+
+    def test_02_token_identity_limit(self, client, settings):
+        set_rates(settings, auth_identity='2/min')
+        data = {'username': 'TestUser', 'confirmation_code': '12345'}
+        for number in range(2):
+            response = client.post(
+                self.URL_TOKEN, data=data, REMOTE_ADDR=f'10.0.0.{number}'
+            )
+            assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+        self.check_rejected_cheaply(lambda: client.post(
+            self.URL_TOKEN, data=dict(data, username='testuser'),
+            REMOTE_ADDR='10.0.0.9'
+        ))
+        response = client.post(
+            self.URL_TOKEN, data=dict(data, username='OtherUser')
+        )
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что лимит по имени пользователя учитывается '
+            'для каждого имени отдельно.'
+        )
+
+    def test_03_bucket_refills(self, client, settings, monkeypatch):
+        clock = Clock()
+        monkeypatch.setattr(TokenBucketThrottle, 'timer', clock)
+        set_rates(settings, auth_ip='2/min')
+        data = {'username': 'TestUser', 'confirmation_code': '12345'}
+        for _ in range(2):
+            client.post(self.URL_TOKEN, data=data)
+        response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert int(response['Retry-After']) == 30
+
+        clock.now += 30
+        response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что корзина пополняется со временем.'
+        )
+        response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+    def test_04_review_create_limit(self, admin_client, user_client,
+                                    settings):
+        set_rates(settings, review_create='1/min')
+        titles, _, _ = create_titles(admin_client)
+        urls = [
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title['id'])
+            for title in titles
+        ]
+        data = {'text': 'Отзыв', 'score': 5}
+        response = user_client.post(urls[0], data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        self.check_rejected_cheaply(
+            lambda: user_client.post(urls[1], data=data)
+        )
+        response = user_client.get(urls[1])
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит на создание отзывов не ограничивает '
+            'чтение.'
+        )
+        response = admin_client.post(urls[1], data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что лимит на создание отзывов учитывается для '
+            'каждого пользователя отдельно.'
+        )
+
+    def test_05_cache_storage(self, client, settings):
+        settings.THROTTLE_BUCKET_STORAGE = (
+            'api.v1.throttling.CacheBucketStorage'
+        )
+        set_rates(settings, auth_ip='1/min')
+        cache.clear()
+        data = {'username': 'TestUser', 'confirmation_code': '12345'}
+        response = client.post(self.URL_TOKEN, data=data)
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+        self.check_rejected_cheaply(
+            lambda: client.post(self.URL_TOKEN, data=data)
+        )
+        cache.clear()
@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.autocomplete import title_index
+from reviews.models import Category, Genre, Title
+
+TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE SAVEPOINT')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def create_catalog(self):
+        Category.objects.create(name='Фильм', slug='films')
+        Category.objects.create(name='Книги', slug='books')
+        for slug in ('horror', 'comedy', 'drama'):
+            Genre.objects.create(name=slug, slug=slug)
+
+    def make_titles(self, count):
+        return [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'description': 'Описание',
+                'genre': ['horror', 'comedy'] if idx % 2 else ['drama'],
+                'category': 'films' if idx % 2 else 'books',
+            }
+            for idx in range(count)
+        ]
+
+    def test_01_bulk_create(self, admin_client):
+        self.create_catalog()
+        data = self.make_titles(3)
+        response = admin_client.post(
+            self.BULK_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'с корректными данными возвращает ответ со статусом 201.'
+        )
+        created = response.json()
+        assert [item['name'] for item in created] == [
+            item['name'] for item in data
+        ]
+        for item, title_data in zip(data, created):
+            title = Title.objects.get(pk=title_data['id'])
+            assert title.name == item['name']
+            assert title.category.slug == item['category']
+            assert sorted(title.genre.values_list('slug', flat=True)) == (
+                sorted(item['genre'])
+            ), 'Проверьте, что жанры связаны с нужными произведениями.'
+        assert title_index.search('Произведение'), (
+            'Проверьте, что созданные произведения попадают в индекс '
+            'автодополнения.'
+        )
+
+    @pytest.mark.parametrize('count', (1, 10, 100))
+    def test_02_bulk_create_query_count(self, admin_client, count):
+        self.create_catalog()
+        admin_client.get('/api/v1/users/me/')
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.BULK_URL, data=self.make_titles(count), format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Title.objects.count() == count
+        queries = [
+            query for query in context.captured_queries
+            if not query['sql'].startswith(TRANSACTION_STATEMENTS)
+        ]
+        assert len(queries) == 5, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` выполняет '
+            'фиксированное число запросов независимо от числа произведений.'
+        )
+
+    def test_03_bulk_create_errors(self, admin_client):
+        self.create_catalog()
+        data = self.make_titles(3)
+        data[1]['genre'] = ['horror', 'unknown']
+        data[2]['category'] = 'unknown'
+        data[2]['year'] = 3000
+        response = admin_client.post(
+            self.BULK_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == len(data), (
+            'Проверьте, что ответ содержит ошибки для каждого элемента.'
+        )
+        assert errors[0] == {}
+        assert 'genre' in errors[1]
+        assert 'category' in errors[2] and 'year' in errors[2]
+        response = admin_client.post(
+            '/api/v1/titles/', data=data[1], format='json'
+        )
+        assert response.json()['genre'] == errors[1]['genre'], (
+            'Проверьте, что о ненайденных жанрах сообщается одинаково '
+            'при создании одного и нескольких произведений.'
+        )
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке не создаётся ни одно произведение.'
+        )
+
+        for invalid_data in ([], {'name': 'Произведение'}):
+            response = admin_client.post(
+                self.BULK_URL, data=invalid_data, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_bulk_create_permissions(self, user_client, moderator_client):
+        self.create_catalog()
+        data = self.make_titles(1)
+        for current_client, expected_status in (
+            (APIClient(), HTTPStatus.UNAUTHORIZED),
+            (user_client, HTTPStatus.FORBIDDEN),
+            (moderator_client, HTTPStatus.FORBIDDEN),
+        ):
+            response = current_client.post(
+                self.BULK_URL, data=data, format='json'
+            )
+            assert response.status_code == expected_status, (
+                f'Проверьте, что `{self.BULK_URL}` доступен только '
+                'администратору.'
+            )
+        assert not Title.objects.exists()
@@ -0,0 +1,187 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.autocomplete import title_index
+from reviews.models import Category, Comment, Genre, Review, Title
+
+CSV_FILES = {
+    'category.csv': (
+        ('id', 'name', 'slug'),
+        (1, 'Фильм', 'movie'),
+        (2, 'Книга', 'book'),
+    ),
+    'genre.csv': (
+        ('id', 'name', 'slug'),
+        (1, 'Драма', 'drama'),
+        (2, 'Комедия', 'comedy'),
+    ),
+    'users.csv': (
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+        (100, 'bingobongo', 'bingobongo@yamdb.fake', 'user', '', '', ''),
+        (101, 'capt_obvious', 'capt@yamdb.fake', 'admin', '', '', ''),
+        (102, 'faulty', 'not-an-email', 'user', '', '', ''),
+    ),
+    'titles.csv': (
+        ('id', 'name', 'year', 'category'),
+        (1, 'Побег из Шоушенка', 1994, 1),
+        (2, 'Крёстный отец', 1972, 1),
+        (3, 'Война и мир', 1869, 2),
+        (4, 'Без категории', 2000, 99),
+    ),
+    'genre_title.csv': (
+        ('id', 'title_id', 'genre_id'),
+        (1, 1, 1),
+        (2, 2, 1),
+        (3, 2, 2),
+        (4, 4, 1),
+    ),
+    'review.csv': (
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        (1, 1, 'Отлично', 100, 10, '2019-09-24T21:08:21.567Z'),
+        (2, 1, 'Хорошо', 101, 7, '2019-09-25T21:08:21.567Z'),
+        (3, 2, 'Неплохо', 100, 5, '2019-09-26T21:08:21.567Z'),
+        (4, 3, 'Нет автора', 102, 5, '2019-09-26T21:08:21.567Z'),
+    ),
+    'comments.csv': (
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        (1, 1, 'Согласен', 101, '2019-09-27T21:08:21.567Z'),
+        (2, 2, 'Спорно', 100, '2019-09-28T21:08:21.567Z'),
+        (3, 4, 'Нет отзыва', 100, '2019-09-28T21:08:21.567Z'),
+    ),
+}
+
+
+def write_csv_files(path):
+    for filename, rows in CSV_FILES.items():
+        with open(path / filename, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(rows)
+
+
+def import_yamdb(path, *args):
+    stdout = StringIO()
+    stderr = StringIO()
+    call_command(
+        'import_yamdb', '--path', str(path), *args,
+        stdout=stdout, stderr=stderr
+    )
+    return stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Import:
+
+    def test_01_import_catalog(self, tmp_path, django_user_model):
+        write_csv_files(tmp_path)
+        title_index.search('Побег')
+        stdout, stderr = import_yamdb(tmp_path)
+
+        assert Category.objects.count() == 2
+        assert Genre.objects.count() == 2
+        assert django_user_model.objects.count() == 2
+        assert Title.objects.count() == 3
+        assert Title.genre.through.objects.count() == 3
+        assert Review.objects.count() == 3
+        assert Comment.objects.count() == 2
+        for line in ('users.csv:4', 'titles.csv:5', 'genre_title.csv:5',
+                     'review.csv:5', 'comments.csv:4'):
+            assert line in stderr, (
+                'Проверьте, что команда `import_yamdb` сообщает о '
+                f'пропущенных строках: {line}.'
+            )
+        assert 'строк/с' in stdout, (
+            'Проверьте, что команда `import_yamdb` сообщает скорость '
+            'загрузки.'
+        )
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из файла.'
+        )
+        title = Title.objects.get(pk=1)
+        assert (title.review_count, title.score_sum, title.rating) == (
+            2, 17, 8
+        ), 'Проверьте, что рейтинг пересчитывается после загрузки.'
+        assert Title.objects.get(pk=3).rating is None
+        assert title_index.search('Побег') == [
+            {'id': 1, 'name': 'Побег из Шоушенка'}
+        ], 'Проверьте, что индекс автодополнения сбрасывается после загрузки.'
+        assert not django_user_model.objects.get(
+            pk=100
+        ).has_usable_password()
+
+    def test_02_import_is_repeatable(self, tmp_path):
+        write_csv_files(tmp_path)
+        import_yamdb(tmp_path)
+        stdout, stderr = import_yamdb(tmp_path)
+        assert Review.objects.count() == 3
+        assert 'уже существует' in stderr, (
+            'Проверьте, что повторная загрузка пропускает существующие '
+            'записи.'
+        )
+
+    def test_03_import_in_batches(self, tmp_path):
+        write_csv_files(tmp_path)
+        with CaptureQueriesContext(connection) as context:
+            import_yamdb(tmp_path, '--batch-size', '2', '--verbosity', '2')
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_review"')
+        ]
+        assert len(inserts) == 2, (
+            'Проверьте, что команда `import_yamdb` вставляет строки '
+            'пакетами заданного размера.'
+        )
+        assert not any(
+            query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+            and 'WHERE' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что внешние ключи проверяются без запросов к базе.'
+
+    def test_04_duplicate_unique_values_skipped(self, tmp_path,
+                                                django_user_model):
+        write_csv_files(tmp_path)
+        duplicates = {
+            'category.csv': (3, 'Кино', 'movie'),
+            'genre.csv': (3, 'Ещё драма', 'drama'),
+            'users.csv': (
+                103, 'bingobongo', 'other@yamdb.fake', 'user', '', '', ''
+            ),
+            'genre_title.csv': (5, 1, 1),
+            'review.csv': (
+                5, 1, 'Ещё раз', 100, 3, '2019-09-29T21:08:21.567Z'
+            ),
+        }
+        for filename, row in duplicates.items():
+            with open(tmp_path / filename, 'a', newline='',
+                      encoding='utf-8') as file:
+                csv.writer(file).writerow(row)
+        with open(tmp_path / 'users.csv', 'a', newline='',
+                  encoding='utf-8') as file:
+            csv.writer(file).writerow(
+                (104, 'another', 'capt@yamdb.fake', 'user', '', '', '')
+            )
+
+        stdout, stderr = import_yamdb(tmp_path, '--batch-size', '1')
+
+        assert Category.objects.count() == 2
+        assert Genre.objects.count() == 2
+        assert django_user_model.objects.count() == 2
+        assert Title.genre.through.objects.count() == 3
+        assert Review.objects.count() == 3
+        assert Comment.objects.count() == 2, (
+            'Проверьте, что после повторяющейся строки загрузка '
+            'продолжается.'
+        )
+        for line in ('category.csv:4', 'genre.csv:4', 'users.csv:5',
+                     'users.csv:6', 'genre_title.csv:6', 'review.csv:6'):
+            assert line in stderr, (
+                'Проверьте, что команда `import_yamdb` пропускает строки '
+                f'с повторяющимися уникальными значениями: {line}.'
+            )
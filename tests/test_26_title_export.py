@@ -0,0 +1,118 @@
+import csv
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1 import export
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TitleExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+
+    def create_titles(self, count):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name='Ужасы', slug='horror'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        titles = []
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение, "{idx}"', year=2000,
+                category=category if idx % 2 else None
+            )
+            title.genre.set(genres[:idx % 3])
+            titles.append(title)
+        return titles
+
+    def read_content(self, response):
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL}` отдаёт потоковый ответ.'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_export_ndjson(self, admin_client):
+        titles = self.create_titles(5)
+        response = admin_client.get(self.EXPORT_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [
+            json.loads(line)
+            for line in self.read_content(response).splitlines()
+        ]
+        assert [row['id'] for row in rows] == [title.id for title in titles]
+        assert rows[0]['category'] is None
+        assert rows[1] == {
+            'id': titles[1].id,
+            'name': titles[1].name,
+            'year': 2000,
+            'category': 'films',
+            'genre': ['horror'],
+            'rating': None,
+            'review_count': 0,
+        }
+        assert rows[2]['genre'] == ['comedy', 'horror']
+
+    def test_02_export_csv(self, admin_client):
+        titles = self.create_titles(3)
+        response = admin_client.get(f'{self.EXPORT_URL}?type=csv')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(
+            self.read_content(response).splitlines()
+        ))
+        assert [row['name'] for row in rows] == [
+            title.name for title in titles
+        ]
+        assert rows[2]['genre'] == 'comedy,horror'
+
+        response = admin_client.get(f'{self.EXPORT_URL}?type=xml')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_export_filters(self, admin_client):
+        self.create_titles(4)
+        response = admin_client.get(f'{self.EXPORT_URL}?category=films')
+        rows = self.read_content(response).splitlines()
+        assert len(rows) == 2, (
+            f'Проверьте, что `{self.EXPORT_URL}` учитывает фильтры '
+            'произведений.'
+        )
+
+    @pytest.mark.parametrize('count', (1, 10))
+    def test_04_export_reads_in_chunks(self, admin_client, monkeypatch,
+                                       count):
+        monkeypatch.setattr(
+            export.iter_title_rows, '__defaults__', (3,)
+        )
+        self.create_titles(count)
+        response = admin_client.get(self.EXPORT_URL)
+        with CaptureQueriesContext(connection) as context:
+            lines = self.read_content(response).splitlines()
+        assert len(lines) == count
+        pages = -(-count // 3)
+        title_queries = [
+            query for query in context.captured_queries
+            if 'FROM "reviews_title"' in query['sql']
+        ]
+        assert len(title_queries) == pages + 1, (
+            'Проверьте, что произведения выгружаются страницами '
+            'фиксированного размера.'
+        )
+        assert len(context.captured_queries) == 2 * pages + 1
+
+    def test_05_export_permissions(self, client, user_client,
+                                   moderator_client):
+        for current_client in (client, user_client, moderator_client):
+            response = current_client.get(self.EXPORT_URL)
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что `{self.EXPORT_URL}` доступен только '
+                'администратору.'
+            )
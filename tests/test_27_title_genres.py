@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+GENRE_SLUGS = ('horror', 'comedy', 'drama', 'fantasy', 'thriller')
+
+
+def genre_queries(context):
+    return [
+        query for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'WHERE "reviews_genre"."slug"' in query['sql']
+    ]
+
+
+def link_queries(context, statement):
+    return [
+        query for query in context.captured_queries
+        if query['sql'].startswith(statement)
+        and '"reviews_title_genre"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27TitleGenres:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_catalog(self):
+        Category.objects.create(name='Фильм', slug='films')
+        for slug in GENRE_SLUGS:
+            Genre.objects.create(name=slug, slug=slug)
+
+    def test_01_create_resolves_genres_once(self, admin_client):
+        self.create_catalog()
+        data = {
+            'name': 'Терминатор',
+            'year': 1984,
+            'genre': list(GENRE_SLUGS),
+            'category': 'films',
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.TITLES_URL, data=data, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(genre_queries(context)) == 1, (
+            f'Проверьте, что POST-запрос к `{self.TITLES_URL}` находит все '
+            'жанры одним запросом.'
+        )
+        assert len(link_queries(context, 'INSERT')) == 1, (
+            'Проверьте, что связи с жанрами добавляются одним запросом.'
+        )
+        assert sorted(response.json()['genre']) == sorted(GENRE_SLUGS)
+
+    def test_02_unknown_genres_in_one_error(self, admin_client):
+        self.create_catalog()
+        data = {
+            'name': 'Терминатор',
+            'year': 1984,
+            'genre': ['horror', 'unknown', 'missing'],
+            'category': 'films',
+        }
+        response = admin_client.post(
+            self.TITLES_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()['genre']
+        assert len(errors) == 1 and 'unknown' in errors[0] and (
+            'missing' in errors[0]
+        ), 'Проверьте, что все ненайденные жанры указаны в одной ошибке.'
+        assert not Title.objects.exists()
+
+    def test_03_update_applies_genre_diff(self, admin_client):
+        self.create_catalog()
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Терминатор',
+            'year': 1984,
+            'genre': ['horror', 'comedy', 'drama'],
+            'category': 'films',
+        }, format='json')
+        title_id = response.json()['id']
+        through = Title.genre.through
+        kept_link = through.objects.get(
+            title_id=title_id, genre__slug='comedy'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                f'{self.TITLES_URL}{title_id}/',
+                data={'genre': ['comedy', 'drama', 'fantasy']},
+                format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert sorted(response.json()['genre']) == [
+            'comedy', 'drama', 'fantasy'
+        ]
+        assert len(link_queries(context, 'DELETE')) == 1
+        assert len(link_queries(context, 'INSERT')) == 1
+        assert through.objects.filter(pk=kept_link.pk).exists(), (
+            'Проверьте, что при изменении жанров сохранённые связи '
+            'не удаляются и не создаются заново.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                f'{self.TITLES_URL}{title_id}/',
+                data={'name': 'Терминатор 2'}, format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert not link_queries(context, 'DELETE') and not link_queries(
+            context, 'INSERT'
+        ), 'Проверьте, что изменение без жанров не трогает связи.'
+        assert sorted(response.json()['genre']) == [
+            'comedy', 'drama', 'fantasy'
+        ]
+
+    @pytest.mark.parametrize('genre', [[{'a': 1}], [['horror']], [1]])
+    def test_04_non_string_genres_rejected(self, admin_client, genre):
+        self.create_catalog()
+        data = {
+            'name': 'Терминатор',
+            'year': 1984,
+            'genre': genre,
+            'category': 'films',
+        }
+        response = admin_client.post(
+            self.TITLES_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{self.TITLES_URL}` с жанрами '
+            'не в виде строк возвращает ответ со статусом 400.'
+        )
+        assert 'genre' in response.json()
+        assert not Title.objects.exists()
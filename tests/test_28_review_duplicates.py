@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_titles
+
+
+def review_selects(context):
+    return [
+        query for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "reviews_review"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ReviewDuplicates:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_create_without_precheck(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'Отзыв', 'score': 7}
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert not review_selects(context), (
+            f'Проверьте, что POST-запрос к `{self.REVIEWS_URL_TEMPLATE}` '
+            'не проверяет повторный отзыв отдельным запросом.'
+        )
+
+    def test_02_duplicate_review(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        user_client.post(url, data={'text': 'Отзыв', 'score': 7})
+
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Если пользователь повторно оставляет отзыв на произведение, '
+            'должен вернуться ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Нельзя повторно оценить произведение.']
+        }
+        assert Review.objects.count() == 1
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.review_count, title.rating) == (1, 7), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг.'
+        )
+
+        response = admin_client.post(url, data={'text': 'Отзыв', 'score': 3})
+        assert response.status_code == HTTPStatus.CREATED
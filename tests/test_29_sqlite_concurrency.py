@@ -0,0 +1,180 @@
+import threading
+import time
+
+import pytest
+from django.db import OperationalError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+READERS = 4
+READS_PER_READER = 20
+WRITERS = 4
+WRITES_PER_WRITER = 50
+WRITER_HOLD = 0.5
+
+
+def open_connection(path):
+    # Отдельное соединение с файловой базой: тестовая база SQLite
+    # находится в памяти и не поддерживает WAL.
+    wrapper = DatabaseWrapper(
+        dict(connection.settings_dict, NAME=str(path)), alias='stress'
+    )
+    wrapper.ensure_connection()
+    return wrapper
+
+
+def execute(wrapper, sql, params=()):
+    with wrapper.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def run_threads(target, count):
+    errors = []
+
+    def run(number):
+        try:
+            target(number)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [
+        threading.Thread(target=run, args=(number,))
+        for number in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29SqliteConcurrency:
+
+    @pytest.fixture
+    def database(self, tmp_path):
+        path = tmp_path / 'db.sqlite3'
+        wrapper = open_connection(path)
+        execute(
+            wrapper,
+            'CREATE TABLE item (id INTEGER PRIMARY KEY, value TEXT)'
+        )
+        execute(wrapper, "INSERT INTO item (value) VALUES ('first')")
+        wrapper.close()
+        return path
+
+    def test_01_pragmas_applied(self, database):
+        wrapper = open_connection(database)
+        pragmas = {
+            name: execute(wrapper, f'PRAGMA {name}')[0][0]
+            for name in ('journal_mode', 'synchronous', 'busy_timeout',
+                         'temp_store')
+        }
+        wrapper.close()
+        assert pragmas == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'temp_store': 2,
+        }, 'Проверьте, что параметры SQLite задаются каждому соединению.'
+
+    def read_while_writing(self, database):
+        writing = threading.Event()
+        done = threading.Event()
+
+        def writer():
+            wrapper = open_connection(database)
+            try:
+                execute(wrapper, 'BEGIN EXCLUSIVE')
+                execute(wrapper, "INSERT INTO item (value) VALUES ('new')")
+                writing.set()
+                done.wait(WRITER_HOLD)
+                execute(wrapper, 'COMMIT')
+            finally:
+                writing.set()
+                wrapper.close()
+
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        writing.wait()
+        counts = []
+
+        def reader(number):
+            wrapper = open_connection(database)
+            try:
+                for _ in range(READS_PER_READER):
+                    counts.append(
+                        execute(wrapper, 'SELECT count(*) FROM item')[0][0]
+                    )
+            finally:
+                wrapper.close()
+
+        started = time.monotonic()
+        errors = run_threads(reader, READERS)
+        elapsed = time.monotonic() - started
+        done.set()
+        writer_thread.join()
+        return errors, counts, elapsed
+
+    def test_02_readers_do_not_wait_for_writer(self, database, settings):
+        settings.SQLITE_PRAGMAS = dict(
+            settings.SQLITE_PRAGMAS, busy_timeout=100
+        )
+        errors, counts, elapsed = self.read_while_writing(database)
+        assert not errors, (
+            'Проверьте, что в режиме WAL чтение не блокируется пишущей '
+            f'транзакцией: {errors}'
+        )
+        assert counts == [1] * READERS * READS_PER_READER, (
+            'Проверьте, что читатели видят последнее зафиксированное '
+            'состояние базы.'
+        )
+        assert elapsed < WRITER_HOLD, (
+            'Проверьте, что читатели не ждут окончания пишущей транзакции.'
+        )
+
+    def test_03_rollback_journal_blocks_readers(self, database, settings):
+        settings.SQLITE_PRAGMAS = dict(
+            settings.SQLITE_PRAGMAS, journal_mode='DELETE', busy_timeout=100
+        )
+        wrapper = open_connection(database)
+        execute(wrapper, 'PRAGMA journal_mode = DELETE')
+        wrapper.close()
+        errors, _, _ = self.read_while_writing(database)
+        assert errors and all(
+            isinstance(error, OperationalError) for error in errors
+        ), 'Без WAL пишущая транзакция блокирует читателей.'
+
+    def test_04_concurrent_writers(self, database):
+
+        def writer(number):
+            wrapper = open_connection(database)
+            try:
+                for idx in range(WRITES_PER_WRITER):
+                    execute(
+                        wrapper, 'INSERT INTO item (value) VALUES (%s)',
+                        (f'{number}-{idx}',)
+                    )
+            finally:
+                wrapper.close()
+
+        def reader(number):
+            wrapper = open_connection(database)
+            try:
+                for _ in range(WRITES_PER_WRITER):
+                    execute(wrapper, 'SELECT count(*) FROM item')
+            finally:
+                wrapper.close()
+
+        errors = run_threads(
+            lambda number: (writer if number % 2 else reader)(number),
+            WRITERS + READERS
+        )
+        assert not errors, (
+            'Проверьте, что параллельные запросы не завершаются ошибкой '
+            f'«database is locked»: {errors}'
+        )
+        wrapper = open_connection(database)
+        count = execute(wrapper, 'SELECT count(*) FROM item')[0][0]
+        wrapper.close()
+        assert count == 1 + WRITERS * WRITES_PER_WRITER
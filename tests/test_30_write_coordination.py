@@ -0,0 +1,188 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import OperationalError, connection
+from rest_framework.test import APIClient
+
+from reviews import database
+from reviews.database import write_coordinator
+from reviews.models import Category, Review
+from tests.utils import create_titles
+from user.outbox import send_pending
+
+THREADS = 4
+
+
+class FlakyWrite:
+
+    def __init__(self, failures, message='database is locked'):
+        self.failures = failures
+        self.message = message
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OperationalError(self.message)
+        return 'done'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30WriteCoordination:
+
+    METRICS_URL = '/api/v1/metrics/database/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        monkeypatch.setattr(database, 'get_retry_delay', lambda attempt: 0)
+        write_coordinator.metrics.reset()
+        yield
+        write_coordinator.metrics.reset()
+
+    def test_01_busy_write_is_retried(self):
+        write = FlakyWrite(failures=2)
+        assert write_coordinator.run(write) == 'done'
+        metrics = write_coordinator.metrics.snapshot()
+        assert (write.calls, metrics['retries']) == (3, 2), (
+            'Проверьте, что транзакция, получившая «database is locked», '
+            'повторяется.'
+        )
+        assert metrics['transactions'] == 1
+
+    def test_02_retries_are_limited(self, settings):
+        settings.SQLITE_WRITE_RETRIES = 2
+        write = FlakyWrite(failures=10)
+        with pytest.raises(OperationalError):
+            write_coordinator.run(write)
+        metrics = write_coordinator.metrics.snapshot()
+        assert write.calls == 3
+        assert (metrics['retries'], metrics['failures']) == (2, 1)
+
+        write = FlakyWrite(failures=1, message='no such table: item')
+        with pytest.raises(OperationalError):
+            write_coordinator.run(write)
+        assert write.calls == 1, (
+            'Проверьте, что повторяются только ошибки блокировки базы.'
+        )
+
+    def test_03_retry_delay_has_jitter(self, monkeypatch):
+        monkeypatch.undo()
+        delays = {database.get_retry_delay(3) for _ in range(20)}
+        assert len(delays) > 1
+        assert all(
+            0 <= delay <= database.WRITE_MAX_RETRY_DELAY for delay in delays
+        )
+
+    def test_04_single_writer(self, settings):
+        settings.SQLITE_SINGLE_WRITER = True
+        active = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def write():
+            with lock:
+                active.append(1)
+                overlaps.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+        def run():
+            try:
+                write_coordinator.run(write)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert overlaps == [1] * THREADS, (
+            'Проверьте, что в режиме одного писателя транзакции процесса '
+            'выполняются по очереди.'
+        )
+        metrics = write_coordinator.metrics.snapshot()
+        assert metrics['transactions'] == THREADS
+        assert metrics['writer_wait_seconds'] > 0
+
+    def test_05_review_post_retried(self, admin_client, user_client,
+                                    monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        save = Review.save
+        calls = []
+
+        def locked_once(review, *args, **kwargs):
+            calls.append(review)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return save(review, *args, **kwargs)
+
+        monkeypatch.setattr(Review, 'save', locked_once)
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запрос на создание отзыва повторяется, если база '
+            'заблокирована.'
+        )
+        assert Review.objects.count() == 1
+
+        response = admin_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.OK
+        metrics = response.json()
+        assert metrics['retries'] == 1
+        assert metrics['single_writer'] is False
+
+        response = user_client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_06_all_writes_coordinated(self, admin_client, user_client,
+                                       monkeypatch):
+        save = Category.save
+        calls = []
+
+        def locked_once(category, *args, **kwargs):
+            calls.append(category)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return save(category, *args, **kwargs)
+
+        monkeypatch.setattr(Category, 'save', locked_once)
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запрос на создание категории повторяется, если '
+            'база заблокирована.'
+        )
+        monkeypatch.undo()
+        monkeypatch.setattr(database, 'get_retry_delay', lambda attempt: 0)
+
+        writes = (
+            (admin_client.post, '/api/v1/genres/',
+             {'name': 'Ужасы', 'slug': 'horror'}),
+            (admin_client.post, '/api/v1/titles/bulk/', [{
+                'name': 'Терминатор', 'year': 1984,
+                'genre': ['horror'], 'category': 'films',
+            }]),
+            (user_client.patch, '/api/v1/users/me/', {'bio': 'Обо мне'}),
+            (APIClient().post, '/api/v1/auth/signup/',
+             {'username': 'newuser', 'email': 'newuser@yamdb.fake'}),
+        )
+        for method, url, data in writes:
+            write_coordinator.metrics.reset()
+            response = method(url, data=data, format='json')
+            assert response.status_code < HTTPStatus.BAD_REQUEST
+            assert write_coordinator.metrics.snapshot()['transactions'] == 1, (
+                f'Проверьте, что запрос к `{url}` выполняется через '
+                'write_coordinator.'
+            )
+
+        write_coordinator.metrics.reset()
+        assert send_pending() == (1, 1)
+        assert write_coordinator.metrics.snapshot()['transactions'] == 1
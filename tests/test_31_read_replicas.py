@@ -0,0 +1,120 @@
+import time
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from rest_framework.test import APIClient
+
+from api.middleware import PRIMARY_COOKIE, PRIMARY_HEADER
+from reviews.autocomplete import title_index
+from reviews.models import Category, Title
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    # Реплика — отдельный файл SQLite, который заполняет replicate_db.
+    connections.databases['replica'] = dict(
+        connections['default'].settings_dict,
+        NAME=str(tmp_path / 'replica.sqlite3')
+    )
+    settings.DATABASE_REPLICAS = ['replica']
+    yield 'replica'
+    connections['replica'].close()
+    delattr(connections._connections, 'replica')
+    del connections.databases['replica']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31ReadReplicas:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def titles_count(self, client, **extra):
+        response = client.get(self.TITLES_URL, **extra)
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['count']
+
+    def test_01_reads_go_to_replica(self, admin_client, replica):
+        create_titles(admin_client)
+        stdout = StringIO()
+        call_command('replicate_db', stdout=stdout)
+        assert replica in stdout.getvalue()
+        Title.objects.create(name='Только в основной базе', year=2000)
+
+        assert self.titles_count(APIClient()) == 2, (
+            'Проверьте, что безопасные запросы читают из реплики.'
+        )
+        call_command('replicate_db', stdout=StringIO())
+        assert self.titles_count(APIClient()) == 3, (
+            'Проверьте, что replicate_db обновляет реплику.'
+        )
+
+    def test_02_writer_reads_from_primary(self, admin_client, replica):
+        call_command('replicate_db', stdout=StringIO())
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'year': 1985}
+        )
+        assert response.status_code == HTTPStatus.OK
+        primary_until = float(response[PRIMARY_HEADER])
+        assert primary_until > time.time()
+        assert PRIMARY_COOKIE in response.cookies
+
+        assert self.titles_count(admin_client) == 2, (
+            'Проверьте, что клиент, который только что изменил данные, '
+            'читает из основной базы.'
+        )
+        assert self.titles_count(
+            APIClient(), HTTP_X_USE_PRIMARY_UNTIL=str(primary_until)
+        ) == 2, (
+            f'Проверьте, что заголовок `{PRIMARY_HEADER}` направляет чтение '
+            'в основную базу.'
+        )
+        assert self.titles_count(APIClient()) == 0
+
+        admin_client.cookies[PRIMARY_COOKIE] = str(time.time() - 1)
+        assert self.titles_count(admin_client) == 0, (
+            'Проверьте, что по истечении срока клиент снова читает из '
+            'реплики.'
+        )
+
+    def test_03_safe_request_without_writes(self, admin_client, replica):
+        call_command('replicate_db', stdout=StringIO())
+        response = APIClient().get(self.TITLES_URL)
+        assert PRIMARY_HEADER not in response
+        assert PRIMARY_COOKIE not in response.cookies
+
+    def test_04_no_replicas_configured(self, admin_client):
+        create_titles(admin_client)
+        assert self.titles_count(APIClient()) == 2
+
+    def test_05_caches_filled_from_primary(self, admin_client, admin,
+                                           replica):
+        call_command('replicate_db', stdout=StringIO())
+        Category.objects.create(name='Фильм', slug='films')
+        response = APIClient().get('/api/v1/categories/')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что кешируемые списки заполняются из основной базы, '
+            'а не из отстающей реплики.'
+        )
+
+        title_index.clear()
+        Title.objects.create(name='Терминатор', year=1984)
+        response = APIClient().get(f'{self.TITLES_URL}autocomplete/?q=терм')
+        assert [title['name'] for title in response.json()] == [
+            'Терминатор'
+        ], 'Проверьте, что индекс подсказок строится по основной базе.'
+
+        admin.role = 'user'
+        admin.save()
+        admin_client.get(self.TITLES_URL)
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книги', 'slug': 'books'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что кеш пользователей заполняется из основной базы: '
+            'иначе пониженный пользователь сохранит старую роль.'
+        )